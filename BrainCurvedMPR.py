@@ -2,27 +2,125 @@ import nibabel as nib
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, Slider
+from matplotlib.transforms import Bbox
+from matplotlib.colors import Normalize
 from scipy.ndimage import map_coordinates, zoom
 from scipy.interpolate import splprep, splev
 import time
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import cupy as cp
+    from cupyx.scipy import ndimage as cupy_ndimage
+    HAS_CUPY = True
+except ImportError:
+    HAS_CUPY = False
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _sample_mpr(data, curve, normals, width_range, out):
+        """Trilinear sampling of the volume along curve + normal * offset"""
+        nx, ny, nz = data.shape
+        flat = data.ravel()
+        # خطوات الـ volume (C-contiguous) محسوبة مرة واحدة
+        step_y = nz
+        step_x = ny * nz
+        for i in prange(curve.shape[0]):
+            cx, cy, cz = curve[i, 0], curve[i, 1], curve[i, 2]
+            dx, dy, dz = normals[i, 0], normals[i, 1], normals[i, 2]
+            for j in range(width_range.shape[0]):
+                sx = cx + dx * width_range[j]
+                sy = cy + dy * width_range[j]
+                sz = cz + dz * width_range[j]
+                if (sx < 0.0 or sy < 0.0 or sz < 0.0 or
+                        sx > nx - 1 or sy > ny - 1 or sz > nz - 1):
+                    out[j, i] = 0.0
+                    continue
+                x0 = min(int(sx), nx - 2)
+                y0 = min(int(sy), ny - 2)
+                z0 = min(int(sz), nz - 2)
+                fx = sx - x0
+                fy = sy - y0
+                fz = sz - z0
+                base = x0 * step_x + y0 * step_y + z0
+                c00 = flat[base] + fx * (flat[base + step_x] - flat[base])
+                c10 = flat[base + step_y] + fx * (flat[base + step_x + step_y] - flat[base + step_y])
+                c01 = flat[base + 1] + fx * (flat[base + step_x + 1] - flat[base + 1])
+                c11 = (flat[base + step_y + 1] +
+                       fx * (flat[base + step_x + step_y + 1] - flat[base + step_y + 1]))
+                c0 = c00 + fy * (c10 - c00)
+                c1 = c01 + fy * (c11 - c01)
+                out[j, i] = c0 + fz * (c1 - c0)
+
+
+def downsample_volume(data, factor):
+    """
+    تصغير الـ volume: متوسط بلوكات للمعامل الصحيح، وإلا zoom خطي
+    """
+    data = np.asarray(data, dtype=np.float32)
+    s = int(factor)
+    if s >= 1 and s == factor:
+        # نجمع الشرائح المتباعدة بخطوة s على كل محور ثم نقسم على s^3
+        d = data[:data.shape[0] // s * s, :data.shape[1] // s * s, :data.shape[2] // s * s]
+        for axis in range(3):
+            d = sum(d[(slice(None),) * axis + (slice(k, None, s),)] for k in range(s))
+        return d / np.float32(s ** 3)
+    return zoom(data, 1 / factor, order=1, prefilter=False, mode='nearest')
+
+
+# مواضع نقاط التحكم الخمس: (نسبة على طول الاتجاه، نسبة الانحناء العمودي)
+CURVE_OFFSETS = np.array([[0.0, 0.0],
+                          [0.25, 0.5],
+                          [0.5, 1.0],
+                          [0.75, 0.5],
+                          [1.0, 0.0]])
+
+
 class InteractiveCurvedMPR:
     def __init__(self, data, downsample_factor=2):
         self.original_data = data
         self.ds_factor = downsample_factor
         
         # تصغير البيانات للسرعة
-        self.data = zoom(data, 1/downsample_factor, order=1)
+        self.data = downsample_volume(data, downsample_factor)
         self.data = (self.data - self.data.min()) / (self.data.max() - self.data.min() + 1e-10)
         
         print(f"Data shape: {self.data.shape}")
         
+        # float32 كافي للبيانات المطبّعة ويقلل الذاكرة للنصف
+        self.data = self.data.astype(np.float32, copy=False)
+        # البيانات مطبّعة [0, 1]: Normalize واحد مشترك لكل الصور
+        self._norm = Normalize(vmin=0, vmax=1)
+        
+        # نسخة من الـ volume على الـ GPU لو CuPy متاح
+        self._d_data = None
+        if HAS_CUPY:
+            try:
+                self._d_data = cp.asarray(self.data)
+            except Exception as e:
+                print(f"⚠ GPU not available, using CPU: {e}")
+        
         # الإعدادات
         self.current_slice_ax = self.data.shape[2] // 2
         self.current_slice_cor = self.data.shape[1] // 2
         self.current_slice_sag = self.data.shape[0] // 2
         
-        self.points = []  # نقاط المسار
+        # نقاط المسار بتخزين SoA: مصفوفة لكل محور + عدد النقاط
+        self._px = np.empty(16, dtype=np.float32)
+        self._py = np.empty(16, dtype=np.float32)
+        self._pz = np.empty(16, dtype=np.float32)
+        self._n_points = 0
+        self._points_version = 0  # يزيد مع كل تعديل على النقاط
+        self._curve_key = None  # (انحناء، نسخة النقاط) لآخر منحنى محسوب
+        self._curve_cache = None
+        self._curve_hr_key = None
+        self._curve_hr_cache = None
         self.curve_factor = 0.4  # زيادة الانحناء الافتراضي
         self.active_view = 'axial'  # الـ view النشط
         self.mpr_height = 140  # زيادة الارتفاع
@@ -47,8 +145,8 @@ class InteractiveCurvedMPR:
                                pad=10,
                                bbox=dict(boxstyle='round,pad=0.6', facecolor='#2196F3', 
                                        edgecolor='#64B5F6', linewidth=2, alpha=0.95))
-        self.img_axial = self.ax_axial.imshow(self.data[:, :, self.current_slice_ax].T, 
-                                              cmap='gray', origin='lower', picker=True, vmin=0, vmax=1)
+        self.img_axial = self.ax_axial.imshow(self._slice_image(2, self.current_slice_ax), 
+                                              cmap='gray', origin='lower', picker=True, norm=self._norm)
         self.ax_axial.axis('off')
         
         # Coronal view
@@ -58,8 +156,8 @@ class InteractiveCurvedMPR:
                                  pad=10,
                                  bbox=dict(boxstyle='round,pad=0.6', facecolor='#4CAF50',
                                          edgecolor='#81C784', linewidth=2, alpha=0.95))
-        self.img_coronal = self.ax_coronal.imshow(self.data[:, self.current_slice_cor, :].T, 
-                                                  cmap='gray', origin='lower', picker=True, vmin=0, vmax=1)
+        self.img_coronal = self.ax_coronal.imshow(self._slice_image(1, self.current_slice_cor), 
+                                                  cmap='gray', origin='lower', picker=True, norm=self._norm)
         self.ax_coronal.axis('off')
         
         # Sagittal view
@@ -69,8 +167,8 @@ class InteractiveCurvedMPR:
                                   pad=10,
                                   bbox=dict(boxstyle='round,pad=0.6', facecolor='#F44336',
                                           edgecolor='#E57373', linewidth=2, alpha=0.95))
-        self.img_sagittal = self.ax_sagittal.imshow(self.data[self.current_slice_sag, :, :].T, 
-                                                    cmap='gray', origin='lower', picker=True, vmin=0, vmax=1)
+        self.img_sagittal = self.ax_sagittal.imshow(self._slice_image(0, self.current_slice_sag), 
+                                                    cmap='gray', origin='lower', picker=True, norm=self._norm)
         self.ax_sagittal.axis('off')
         
         # معلومات احترافية
@@ -152,6 +250,8 @@ class InteractiveCurvedMPR:
         
         # توصيل أحداث الماوس
         self.fig.canvas.mpl_connect('button_press_event', self.on_click)
+        self.fig.canvas.mpl_connect('resize_event', self._on_resize)
+        self._mpr_im = None
         
         # رسم المؤشرات الأولية بتصميم neon
         self.line_axial, = self.ax_axial.plot([], [], '-', color='#FF1744', linewidth=3, alpha=0.9)
@@ -174,13 +274,46 @@ class InteractiveCurvedMPR:
                                                alpha=0.95, edgecolor='#00BCD4', linewidth=2.5))
         
         plt.tight_layout()
+        
+        # blitting: الخطوط والنقاط ونص المعلومات تُرسم فوق خلفية محفوظة
+        self._blit_views = [(self.ax_axial, self.line_axial, self.points_axial),
+                            (self.ax_coronal, self.line_coronal, self.points_coronal),
+                            (self.ax_sagittal, self.line_sagittal, self.points_sagittal)]
+        self._backgrounds = None
+        if getattr(self.fig.canvas, 'supports_blit', False):
+            for _, line, pts in self._blit_views:
+                line.set_animated(True)
+                pts.set_animated(True)
+            self.info_text.set_animated(True)
+            self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+    
+    def _slice_image(self, axis, index):
+        """شريحة 2D متصلة في الذاكرة بالاتجاه اللي يعرضه imshow"""
+        return np.ascontiguousarray(np.take(self.data, index, axis=axis).T)
     
     def get_info_text(self):
         """نص المعلومات"""
-        return (f"● Selected Points: {len(self.points)} | "
+        return (f"● Selected Points: {self._n_points} | "
                 f"Curvature: {self.curve_factor:.2f} | "
                 f"MPR Resolution: {self.mpr_points}×{self.mpr_height} ●")
     
+    @property
+    def points(self):
+        """النقاط المختارة كمصفوفة (n, 3) - تُبنى فقط عند الحاجة"""
+        n = self._n_points
+        return np.stack([self._px[:n], self._py[:n], self._pz[:n]], axis=1)
+    
+    def _add_point(self, point):
+        """إضافة نقطة مع مضاعفة السعة عند الامتلاء"""
+        if self._n_points == len(self._px):
+            self._px = np.concatenate([self._px, np.empty_like(self._px)])
+            self._py = np.concatenate([self._py, np.empty_like(self._py)])
+            self._pz = np.concatenate([self._pz, np.empty_like(self._pz)])
+        n = self._n_points
+        self._px[n], self._py[n], self._pz[n] = point
+        self._n_points += 1
+        self._points_version += 1
+    
     def on_click(self, event):
         """معالجة نقرات الماوس"""
         if event.inaxes in [self.ax_axial, self.ax_coronal, self.ax_sagittal]:
@@ -195,14 +328,14 @@ class InteractiveCurvedMPR:
                 elif event.inaxes == self.ax_sagittal:
                     point = [self.current_slice_sag, x, y]
                 
-                self.points.append(point)
-                print(f"Added point {len(self.points)}: {point}")
+                self._add_point(point)
+                print(f"Added point {self._n_points}: {point}")
                 
                 self.update_display()
     
     def update_display(self):
         """تحديث العرض"""
-        if len(self.points) == 0:
+        if self._n_points == 0:
             # مسح الخطوط
             self.line_axial.set_data([], [])
             self.points_axial.set_data([], [])
@@ -211,116 +344,131 @@ class InteractiveCurvedMPR:
             self.line_sagittal.set_data([], [])
             self.points_sagittal.set_data([], [])
         else:
-            points_arr = np.array(self.points)
+            n = self._n_points
+            px, py, pz = self._px[:n], self._py[:n], self._pz[:n]
             
             # Axial view
-            self.points_axial.set_data(points_arr[:, 0], points_arr[:, 1])
-            if len(self.points) >= 2:
+            self.points_axial.set_data(px, py)
+            if self._n_points >= 2:
                 curve = self.create_curve()
                 self.line_axial.set_data(curve[:, 0], curve[:, 1])
             else:
                 self.line_axial.set_data([], [])
             
             # Coronal view
-            self.points_coronal.set_data(points_arr[:, 0], points_arr[:, 2])
-            if len(self.points) >= 2:
+            self.points_coronal.set_data(px, pz)
+            if self._n_points >= 2:
                 self.line_coronal.set_data(curve[:, 0], curve[:, 2])
             else:
                 self.line_coronal.set_data([], [])
             
             # Sagittal view
-            self.points_sagittal.set_data(points_arr[:, 1], points_arr[:, 2])
-            if len(self.points) >= 2:
+            self.points_sagittal.set_data(py, pz)
+            if self._n_points >= 2:
                 self.line_sagittal.set_data(curve[:, 1], curve[:, 2])
             else:
                 self.line_sagittal.set_data([], [])
         
         self.info_text.set_text(self.get_info_text())
-        self.fig.canvas.draw_idle()
+        if self._backgrounds is None:
+            self.fig.canvas.draw_idle()
+        else:
+            self._blit_overlays()
+    
+    def _on_draw(self, event):
+        """حفظ خلفيات الـ views بعد كل رسم كامل"""
+        canvas = self.fig.canvas
+        self._backgrounds = [canvas.copy_from_bbox(ax.bbox) for ax, _, _ in self._blit_views]
+        # شريط أعلى الشكل فوق الـ views (مكان نص المعلومات)
+        top = max(ax.bbox.y1 for ax, _, _ in self._blit_views)
+        self._info_region = Bbox.from_extents(self.fig.bbox.x0, top,
+                                              self.fig.bbox.x1, self.fig.bbox.y1)
+        self._info_background = canvas.copy_from_bbox(self._info_region)
+        self._blit_overlays()
+    
+    def _blit_overlays(self):
+        """إعادة رسم الخطوط والنقاط ونص المعلومات فقط"""
+        canvas = self.fig.canvas
+        for (ax, line, pts), background in zip(self._blit_views, self._backgrounds):
+            canvas.restore_region(background)
+            ax.draw_artist(line)
+            ax.draw_artist(pts)
+            canvas.blit(ax.bbox)
+        canvas.restore_region(self._info_background)
+        self.fig.draw_artist(self.info_text)
+        canvas.blit(self._info_region)
+    
+    def _fit_spline(self, control_points, n_samples):
+        """Spline تمر بنقاط التحكم، أو None لو النقاط مكررة"""
+        k = 3 if len(control_points) >= 4 else len(control_points) - 1
+        try:
+            tck, u = splprep([control_points[:, 0], control_points[:, 1], control_points[:, 2]], 
+                            s=0, k=k)
+        except (ValueError, TypeError):
+            return None
+        return np.array(splev(np.linspace(0, 1, n_samples), tck)).T
+    
+    def _build_controls(self, points_arr):
+        """نقاط التحكم: 5 نقاط منحنية بين نقطتين، أو النقاط نفسها"""
+        if len(points_arr) != 2:
+            return points_arr
+        
+        start, end = points_arr[0], points_arr[1]
+        direction = end - start
+        
+        if abs(direction[0]) > abs(direction[2]):
+            perpendicular = np.array([-direction[1], direction[0], 0])
+        else:
+            perpendicular = np.array([0, -direction[2], direction[1]])
+        
+        bend = perpendicular * (np.linalg.norm(direction) * self.curve_factor /
+                                (np.linalg.norm(perpendicular) + 1e-10))
+        return start + CURVE_OFFSETS[:, 0:1] * direction + CURVE_OFFSETS[:, 1:2] * bend
     
     def create_curve(self):
         """إنشاء منحنى من النقاط"""
-        if len(self.points) < 2:
+        if self._n_points < 2:
             return np.array([])
         
-        points_arr = np.array(self.points, dtype=float)
+        key = (self.curve_factor, self._points_version)
+        if key == self._curve_key:
+            return self._curve_cache
         
-        if len(self.points) == 2:
-            # منحنى بين نقطتين
-            start, end = points_arr[0], points_arr[1]
-            mid = (start + end) / 2
-            direction = end - start
-            
-            if abs(direction[0]) > abs(direction[2]):
-                perpendicular = np.array([-direction[1], direction[0], 0])
-            else:
-                perpendicular = np.array([0, -direction[2], direction[1]])
-            
-            perpendicular = perpendicular / (np.linalg.norm(perpendicular) + 1e-10)
-            
-            control_points = np.array([
-                start,
-                start + direction * 0.25 + perpendicular * np.linalg.norm(direction) * self.curve_factor * 0.5,
-                mid + perpendicular * np.linalg.norm(direction) * self.curve_factor,
-                end - direction * 0.25 + perpendicular * np.linalg.norm(direction) * self.curve_factor * 0.5,
-                end
-            ])
-        else:
-            # استخدام كل النقاط
-            control_points = points_arr
+        points_arr = self.points.astype(float)
         
-        try:
-            tck, u = splprep([control_points[:, 0], control_points[:, 1], control_points[:, 2]], 
-                            s=0, k=min(3, len(control_points)-1))
-            u_new = np.linspace(0, 1, 100)
-            curve = np.array(splev(u_new, tck)).T
-            return curve
-        except:
+        control_points = self._build_controls(points_arr)
+        
+        curve = self._fit_spline(control_points, 100)
+        if curve is None:
             return points_arr
+        self._curve_key, self._curve_cache = key, curve
+        return curve
     
     def create_curve_high_res(self):
         """إنشاء منحنى بدقة عالية للـ MPR"""
-        if len(self.points) < 2:
+        if self._n_points < 2:
             return np.array([])
         
-        points_arr = np.array(self.points, dtype=float)
+        key = (self.mpr_points, self.curve_factor, self._points_version)
+        if key == self._curve_hr_key:
+            return self._curve_hr_cache
         
-        if len(self.points) == 2:
-            start, end = points_arr[0], points_arr[1]
-            mid = (start + end) / 2
-            direction = end - start
-            
-            if abs(direction[0]) > abs(direction[2]):
-                perpendicular = np.array([-direction[1], direction[0], 0])
-            else:
-                perpendicular = np.array([0, -direction[2], direction[1]])
-            
-            perpendicular = perpendicular / (np.linalg.norm(perpendicular) + 1e-10)
-            
-            control_points = np.array([
-                start,
-                start + direction * 0.25 + perpendicular * np.linalg.norm(direction) * self.curve_factor * 0.5,
-                mid + perpendicular * np.linalg.norm(direction) * self.curve_factor,
-                end - direction * 0.25 + perpendicular * np.linalg.norm(direction) * self.curve_factor * 0.5,
-                end
-            ])
-        else:
-            control_points = points_arr
+        points_arr = self.points.astype(float)
         
-        try:
-            tck, u = splprep([control_points[:, 0], control_points[:, 1], control_points[:, 2]], 
-                            s=0, k=min(3, len(control_points)-1))
-            u_new = np.linspace(0, 1, self.mpr_points)  # دقة قابلة للتعديل
-            curve = np.array(splev(u_new, tck)).T
-            return curve
-        except:
+        control_points = self._build_controls(points_arr)
+        
+        curve = self._fit_spline(control_points, self.mpr_points)  # دقة قابلة للتعديل
+        if curve is None:
             return points_arr
+        self._curve_hr_key, self._curve_hr_cache = key, curve
+        return curve
     
     def generate_mpr(self, event):
         """توليد الـ Curved MPR"""
-        if len(self.points) < 2:
+        if self._n_points < 2:
             print("⚠ Need at least 2 points!")
             self.ax_mpr.clear()
+            self._mpr_im = None
             self.ax_mpr.text(0.5, 0.5, '⚠ Add at least 2 points first!', 
                            ha='center', va='center', fontsize=16, color='red', fontweight='bold')
             self.ax_mpr.axis('off')
@@ -340,7 +488,7 @@ class InteractiveCurvedMPR:
         # تحسين التباين بشكل أفضل
         if mpr_image.max() > 0:
             # Adaptive histogram equalization
-            p1, p99 = np.percentile(mpr_image[mpr_image > 0], (1, 99))
+            p1, p99 = np.percentile(self._nonzero_sample(mpr_image), (1, 99))
             mpr_enhanced = np.clip((mpr_image - p1) / (p99 - p1 + 1e-10), 0, 1)
             
             # زيادة الـ sharpness
@@ -355,10 +503,15 @@ class InteractiveCurvedMPR:
         # استخدام aspect ratio محسّن
         aspect_ratio = mpr_enhanced.shape[0] / mpr_enhanced.shape[1]
         
-        im = self.ax_mpr.imshow(mpr_enhanced, cmap='gray', 
-                                aspect=aspect_ratio * 2.2,
-                                interpolation='lanczos',
-                                vmin=0, vmax=1)
+        self._mpr_source = mpr_enhanced
+        self._mpr_aspect = aspect_ratio * 2.2
+        im = self.ax_mpr.imshow(self._resample_mpr(), cmap='gray', 
+                                aspect=self._mpr_aspect,
+                                interpolation='nearest',
+                                extent=(-0.5, mpr_enhanced.shape[1] - 0.5,
+                                        mpr_enhanced.shape[0] - 0.5, -0.5),
+                                norm=self._norm)
+        self._mpr_im = im
         
         # إضافة colorbar احترافي
         from mpl_toolkits.axes_grid1 import make_axes_locatable
@@ -411,81 +564,94 @@ class InteractiveCurvedMPR:
         print(f"  Resolution: {mpr_enhanced.shape}")
         print("="*50)
     
+    def _resample_mpr(self):
+        """تكبير الـ MPR مرة واحدة لحجم العرض (cubic) بدل lanczos في كل رسم"""
+        image = self._mpr_source
+        h, w = image.shape
+        box = self.ax_mpr.get_window_extent()
+        scale = min(box.width / w, box.height / (self._mpr_aspect * h))
+        factors = (max(1.0, scale * self._mpr_aspect), max(1.0, scale))
+        if factors == (1.0, 1.0):
+            return image
+        return np.clip(zoom(image, factors, order=3), 0, 1)
+    
+    def _on_resize(self, event):
+        if self._mpr_im is not None:
+            self._mpr_im.set_data(self._resample_mpr())
+    
+    @staticmethod
+    def _nonzero_sample(image):
+        """قيم غير صفرية من عينة كل 2 بكسل (كافية لحساب الـ percentiles)"""
+        sample = image[::2, ::2]
+        sample = sample[sample > 0]
+        return sample if sample.size else image[image > 0]
+    
     def extract_mpr(self, curve_path):
         """استخراج Curved MPR"""
         num_points = len(curve_path)
         normals = self.compute_normals(curve_path)
         
         height = self.mpr_height
-        mpr_image = np.zeros((height, num_points))
         width_range = np.linspace(-height/2, height/2, height)
         
-        print("Progress: ", end="", flush=True)
-        step = max(1, num_points // 10)
-        
-        for i in range(num_points):
-            if i % step == 0:
-                print("█", end="", flush=True)
-            
-            center = curve_path[i]
-            normal = normals[i]
-            
-            for j, offset in enumerate(width_range):
-                sample_point = center + normal * offset
-                
-                if all(0 <= sample_point[k] < self.data.shape[k]-1 for k in range(3)):
-                    coords = sample_point.reshape(3, 1)
-                    value = map_coordinates(self.data, coords, order=1, mode='constant', cval=0.0)
-                    mpr_image[j, i] = value[0]
+        if self._d_data is not None:
+            d_samples = (cp.asarray(curve_path.T)[:, None, :] +
+                         cp.asarray(normals.T)[:, None, :] * cp.asarray(width_range)[None, :, None])
+            values = cupy_ndimage.map_coordinates(self._d_data, d_samples.reshape(3, -1),
+                                                  order=1, mode='constant', cval=0.0)
+            return values.reshape(height, num_points).get()
+        
+        if HAS_NUMBA:
+            mpr_image = np.empty((height, num_points), dtype=np.float32)
+            _sample_mpr(self.data, curve_path, normals, width_range, mpr_image)
+            return mpr_image
+        
+        # كل نقاط العينة مرة واحدة: (3, height, num_points)
+        samples = (curve_path.T[:, None, :] +
+                   normals.T[:, None, :] * width_range[None, :, None])
+        values = map_coordinates(self.data, samples.reshape(3, -1),
+                                 order=1, mode='constant', cval=0.0)
+        mpr_image = values.reshape(height, num_points)
         
-        print(" ✓")
         return mpr_image
     
     def compute_normals(self, curve):
         """حساب الاتجاهات العمودية"""
-        n_points = len(curve)
-        normals = np.zeros_like(curve)
-        
-        for i in range(n_points):
-            if i == 0:
-                tangent = curve[i+1] - curve[i]
-            elif i == n_points - 1:
-                tangent = curve[i] - curve[i-1]
-            else:
-                tangent = (curve[i+1] - curve[i-1]) / 2
-            
-            tangent = tangent / (np.linalg.norm(tangent) + 1e-10)
-            
-            if abs(tangent[2]) < 0.9:
-                normal = np.cross(tangent, np.array([0, 0, 1]))
-            else:
-                normal = np.cross(tangent, np.array([1, 0, 0]))
-            
-            normals[i] = normal / (np.linalg.norm(normal) + 1e-10)
+        tangents = np.gradient(curve, axis=0)
+        tangents = tangents / (np.linalg.norm(tangents, axis=1, keepdims=True) + 1e-10)
+        
+        ref = np.where(np.abs(tangents[:, 2:3]) < 0.9,
+                       np.array([0.0, 0.0, 1.0]), np.array([1.0, 0.0, 0.0]))
+        normals = np.cross(tangents, ref)
         
-        return normals
+        return normals / (np.linalg.norm(normals, axis=1, keepdims=True) + 1e-10)
     
     def clear_points(self, event):
         """مسح كل النقاط"""
-        self.points = []
+        self._n_points = 0
+        self._points_version += 1
         self.ax_mpr.clear()
+        self._mpr_im = None
         self.ax_mpr.set_title('★ CURVED MPR - Select points and click "Generate MPR" ★', 
                              fontweight='bold', fontsize=13, color='red')
         self.ax_mpr.axis('off')
         self.update_display()
+        self.fig.canvas.draw_idle()
         print("✓ All points cleared")
     
     def undo_last(self, event):
         """التراجع عن آخر نقطة"""
-        if self.points:
-            removed = self.points.pop()
+        if self._n_points:
+            removed = self.points[-1].tolist()
+            self._n_points -= 1
+            self._points_version += 1
             print(f"✓ Removed point: {removed}")
             self.update_display()
     
     def update_curve_factor(self, val):
         """تحديث معامل الانحناء"""
         self.curve_factor = val
-        if len(self.points) >= 2:
+        if self._n_points >= 2:
             self.update_display()
     
     def show(self):
@@ -1,10 +1,18 @@
 import os
-import glob
 import numpy as np
 import pyvista as pv
 from PyQt5 import QtWidgets, QtCore
 from pyvistaqt import BackgroundPlotter
 import sys
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
 
 """
 🫀 Realistic Heart Cardiac Cycle Animation
@@ -34,6 +42,46 @@ ANATOMICAL_COLORS = {
     'default':           (0.70, 0.13, 0.13),
 }
 
+# Region enum and color table indexed by it
+REGION_IDX = {name: i for i, name in enumerate(ANATOMICAL_COLORS)}
+COLOR_TABLE = np.array(list(ANATOMICAL_COLORS.values()), dtype=np.float32)
+
+# Handle parameters are linear in a few phase curves evaluated once per t:
+#   atrial   - smooth ramp over atrial systole (0.00 - 0.15)
+#   systolic - smooth ramp over ventricular systole (0.15 - 0.45)
+#   diastolic- smooth ramp over diastole (0.45 - 1.00)
+#   twist    - half sine over ventricular systole
+#   pulse    - half sine over the vessel pulse wave (0.15 - 0.50)
+#   hold     - 1 during ventricular systole
+PHASE_CURVES = ['atrial', 'systolic', 'diastolic', 'twist', 'pulse', 'hold']
+HANDLES = ['scale', 'dy', 'longitudinal', 'twist']
+
+# Per-region coefficients: {(handle, curve): amplitude at 100% strength}
+REGION_MOTION = {
+    'right_atrium':     {('scale', 'atrial'): -0.10, ('scale', 'diastolic'): 0.06},
+    'left_atrium':      {('scale', 'atrial'): -0.10, ('scale', 'diastolic'): 0.06},
+    'right_ventricle':  {('scale', 'systolic'): -0.14, ('longitudinal', 'systolic'): 0.06,
+                         ('twist', 'twist'): -0.06},
+    'left_ventricle':   {('scale', 'systolic'): -0.18, ('longitudinal', 'systolic'): 0.06,
+                         ('twist', 'twist'): -0.10},
+    'mitral_valve':     {('dy', 'atrial'): 0.36, ('dy', 'hold'): -0.24, ('dy', 'diastolic'): 0.30},
+    'tricuspid_valve':  {('dy', 'atrial'): 0.36, ('dy', 'hold'): -0.24, ('dy', 'diastolic'): 0.30},
+    'aortic_valve':     {('scale', 'systolic'): 0.03, ('dy', 'systolic'): 0.375},
+    'pulmonary_valve':  {('scale', 'systolic'): 0.03, ('dy', 'systolic'): 0.375},
+    'papillary':        {('scale', 'systolic'): -0.12},
+    'chordae':          {('dy', 'systolic'): -0.25},
+    'septum':           {('scale', 'systolic'): -0.04},
+    'aorta':            {('scale', 'pulse'): 0.06},
+    'pulmonary_artery': {('scale', 'pulse'): 0.06},
+    'vena_cava':        {('scale', 'pulse'): 0.06},
+    'vessel':           {('scale', 'pulse'): 0.06},
+}
+
+HANDLE_COEF = np.zeros((len(REGION_IDX), len(HANDLES), len(PHASE_CURVES)), dtype=np.float32)
+for _region, _coefs in REGION_MOTION.items():
+    for (_handle, _curve), _value in _coefs.items():
+        HANDLE_COEF[REGION_IDX[_region], HANDLES.index(_handle), PHASE_CURVES.index(_curve)] = _value
+
 
 def classify_heart_part(filename: str) -> str:
     """Classify heart part by filename"""
@@ -81,12 +129,156 @@ def classify_heart_part(filename: str) -> str:
     return 'default'
 
 
+def find_obj_files(folder):
+    """Sorted .obj paths in folder (any extension case), in one directory pass"""
+    return sorted(
+        entry.path for entry in os.scandir(folder)
+        if entry.is_file() and entry.name.lower().endswith('.obj')
+    )
+
+
+# Parts above this many points are decimated for the realtime animation
+DECIMATE_ABOVE_POINTS = 10000
+
+
+def load_part_arrays(path):
+    """Read, clean, decimate and compute normals for one OBJ (runs in a worker process).
+    
+    Returns plain arrays (points, faces, normals) since VTK objects do not
+    pickle cleanly, or None for an empty mesh.
+    """
+    mesh = pv.read(path)
+    if mesh.n_points == 0:
+        return None
+    
+    mesh = mesh.clean()
+    if mesh.n_points > DECIMATE_ABOVE_POINTS:
+        mesh = mesh.triangulate().decimate_pro(0.8, preserve_topology=True)
+    mesh = mesh.compute_normals(auto_orient_normals=False, consistent_normals=False)
+    return (np.asarray(mesh.points, dtype=np.float32), np.asarray(mesh.faces),
+            np.asarray(mesh.point_data['Normals'], dtype=np.float32))
+
+
 def smooth_step(t):
     """Smooth interpolation"""
     return t * t * (3 - 2 * t)
 
 
+SMOOTH_STEP_LUT = smooth_step(np.linspace(0.0, 1.0, 1024)).astype(np.float32)
+
+
+def smooth_step_lut(t):
+    """smooth_step for a scalar t in [0, 1] via the 1024-entry table"""
+    return SMOOTH_STEP_LUT[int(t * 1023 + 0.5)]
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _deform_kernel(vectors, centers, part_index, longitudinal_basis, y_twist,
+                       scale, dy, longitudinal, twist, out):
+        """Per-vertex handle deformation (scale, y shift, twist) in one loop"""
+        for i in prange(vectors.shape[0]):
+            p = part_index[i]
+            s = scale[p]
+            rx = vectors[i, 0] * s
+            rz = vectors[i, 2] * s
+            out[i, 1] = centers[p, 1] + vectors[i, 1] * s + dy[p] + longitudinal[p] * longitudinal_basis[i]
+            
+            angle = twist[p] * y_twist[i]
+            if angle != 0.0:
+                a2 = angle * angle
+                c = 1.0 - 0.5 * a2
+                sn = angle * (1.0 - a2 * (1.0 / 6.0))
+                out[i, 0] = centers[p, 0] + rx * c - rz * sn
+                out[i, 2] = centers[p, 2] + rx * sn + rz * c
+            else:
+                out[i, 0] = centers[p, 0] + rx
+                out[i, 2] = centers[p, 2] + rz
+
+
+class CardiacCycleWorker(QtCore.QObject):
+    """Blends the baked keyframes on a background thread.
+    
+    Frames are written into two alternating buffers; frame_ready carries the
+    index of the buffer that was just filled. Readers hold mutex while copying.
+    """
+    frame_ready = QtCore.pyqtSignal(int, float, float)
+    
+    def __init__(self):
+        super().__init__()
+        self.mutex = QtCore.QMutex()
+        self.keyframes = None
+        self.buffers = None
+        self.back = 0
+        self.time = 0.0
+        self.heart_rate = 75
+        self.dt = 0.033
+        self.timer = None
+    
+    def set_keyframes(self, keyframes):
+        self.mutex.lock()
+        try:
+            self.keyframes = keyframes
+            if self.buffers is None or self.buffers[0].shape != keyframes.shape[1:]:
+                self.buffers = [np.empty(keyframes.shape[1:], dtype=np.float32) for _ in range(2)]
+        finally:
+            self.mutex.unlock()
+    
+    def reset(self):
+        self.mutex.lock()
+        self.time = 0.0
+        self.mutex.unlock()
+    
+    @QtCore.pyqtSlot()
+    def start(self):
+        # Created here so the timer lives in the worker thread
+        if self.timer is None:
+            self.timer = QtCore.QTimer()
+            self.timer.setInterval(33)  # ~30 FPS
+            self.timer.timeout.connect(self._tick)
+        self.timer.start()
+    
+    @QtCore.pyqtSlot()
+    def stop(self):
+        if self.timer is not None:
+            self.timer.stop()
+    
+    def _tick(self):
+        self.mutex.lock()
+        try:
+            if self.keyframes is None:
+                return
+            
+            beat_duration = 60.0 / self.heart_rate
+            self.time += self.dt
+            
+            # Cycle position (0-1)
+            t = (self.time % beat_duration) / beat_duration
+            
+            # Blend the two keyframes around t
+            keyframes = self.keyframes
+            n = len(keyframes) - 1
+            pos = t * n
+            i = min(int(pos), n - 1)
+            a = pos - i
+            buf = self.buffers[self.back]
+            np.subtract(keyframes[i + 1], keyframes[i], out=buf)
+            buf *= a
+            buf += keyframes[i]
+            
+            index = self.back
+            self.back ^= 1
+            elapsed = self.time
+        finally:
+            self.mutex.unlock()
+        
+        self.frame_ready.emit(index, t, elapsed)
+
+
 class RealisticHeartCycle(QtWidgets.QMainWindow):
+    start_worker = QtCore.pyqtSignal()
+    stop_worker = QtCore.pyqtSignal()
+    
     def __init__(self, parts_folder):
         super().__init__()
         self.parts_folder = parts_folder
@@ -94,7 +286,6 @@ class RealisticHeartCycle(QtWidgets.QMainWindow):
         
         # Animation state
         self.is_animating = False
-        self.time = 0.0
         self.beat_count = 0
         
         # Cardiac parameters
@@ -106,10 +297,35 @@ class RealisticHeartCycle(QtWidgets.QMainWindow):
         self.original_centers = {}
         self.original_bounds = {}
         
-        # Timer
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self._update_cardiac_cycle)
-        self.timer.setInterval(33)  # ~30 FPS
+        # Precomputed cycle: (n_keyframes + 1, n_total, 3) vertex buffers
+        self.n_keyframes = 40
+        self.keyframes = None
+        
+        # Keyframe blending runs on a worker thread
+        self.worker = CardiacCycleWorker()
+        self.worker_thread = QtCore.QThread(self)
+        self.worker.moveToThread(self.worker_thread)
+        self.worker.frame_ready.connect(self._update_cardiac_cycle)
+        self.start_worker.connect(self.worker.start)
+        self.stop_worker.connect(self.worker.stop)
+        self.worker_thread.start()
+        
+        # Render throttling: every tick renders while frames are cheap; once the
+        # measured frame cost outgrows the tick, renders are spaced out instead
+        self.frame_budget = 0.033
+        self.slow_render_interval = 0.1
+        self.render_interval = 0.0
+        self._frame_cost = 0.0
+        self._update_cost = 0.0
+        self._last_render = 0.0
+        self._render_pending = False
+        self._phase_name = None
+        
+        # Re-bake keyframes once the amplitude slider settles
+        self.bake_timer = QtCore.QTimer()
+        self.bake_timer.setSingleShot(True)
+        self.bake_timer.setInterval(150)
+        self.bake_timer.timeout.connect(self._bake_keyframes)
         
         self.setWindowTitle("Heart Cardiac pump")
         self.resize(1600, 900)
@@ -339,33 +555,47 @@ class RealisticHeartCycle(QtWidgets.QMainWindow):
     
     def _load_heart_parts(self):
         """Load individual heart parts"""
-        obj_files = glob.glob(os.path.join(self.parts_folder, "*.obj"))
-        obj_files.extend(glob.glob(os.path.join(self.parts_folder, "*.OBJ")))
-        obj_files = sorted(list(set(obj_files)))
+        obj_files = find_obj_files(self.parts_folder)
         
         print(f"\n🔍 Found {len(obj_files)} OBJ files in {self.parts_folder}")
         
+        # Files are independent, so read them in parallel processes. Spawned, not
+        # forked: the keyframe worker thread and Qt's own threads are already running
+        workers = max(1, min(os.cpu_count() or 1, len(obj_files)))
+        spawn = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=spawn) as pool:
+            futures = [pool.submit(load_part_arrays, path) for path in obj_files]
+            results = []
+            for path, future in zip(obj_files, futures):
+                try:
+                    results.append((path, future.result()))
+                except Exception as e:
+                    print(f"❌ Error loading {path}: {e}")
+        
         loaded = 0
-        for path in obj_files:
+        for path, arrays in results:
             try:
-                mesh = pv.read(path)
-                if mesh.n_points == 0:
+                if arrays is None:
                     continue
                 
-                mesh = mesh.clean()
-                mesh = mesh.compute_normals(auto_orient_normals=True)
+                points, faces, normals = arrays
+                mesh = pv.PolyData(points, faces)
+                mesh.point_data['Normals'] = normals
+                mesh.point_data.active_normals_name = 'Normals'
                 
                 name = os.path.basename(path)
                 region = classify_heart_part(name)
-                color = ANATOMICAL_COLORS.get(region, ANATOMICAL_COLORS['default'])
+                region_id = REGION_IDX[region]
                 
                 self.parts.append({
                     'name': name,
                     'mesh': mesh,
-                    'color': color,
+                    'color': tuple(COLOR_TABLE[region_id].tolist()),
                     'region': region,
-                    'original_center': np.array(mesh.center),
-                    'actor': None
+                    'region_id': region_id,
+                    'original_center': np.asarray(mesh.center, dtype=np.float32),
+                    'actor': None,
+                    'dirty': False
                 })
                 
                 print(f"✅ {name[:50]:<50} → {region}")
@@ -379,22 +609,58 @@ class RealisticHeartCycle(QtWidgets.QMainWindow):
     
     def _setup_scene(self):
         """Setup 3D scene"""
-        for part in self.parts:
-            actor = self.plotter.add_mesh(
-                part['mesh'],
-                color=part['color'],
+        # All parts share one composite actor; colors are set per block.
+        # Normals come from the loader, so smooth_shading stays off: with it on,
+        # add_composite renders a normals copy the animation never writes to
+        if self.parts:
+            blocks = pv.MultiBlock({part['name']: part['mesh'] for part in self.parts})
+            actor, mapper = self.plotter.add_composite(
+                blocks,
+                color=ANATOMICAL_COLORS['default'],
                 opacity=0.95,
-                smooth_shading=True,
+                smooth_shading=False,
+                interpolation='phong',
                 ambient=0.3,
                 diffuse=0.7,
                 specular=0.8,
                 specular_power=50
             )
-            part['actor'] = actor
+            # Block 0 is the MultiBlock itself, parts start at 1
+            for i, part in enumerate(self.parts, start=1):
+                mapper.block_attr[i].color = part['color']
+                part['actor'] = actor
+                # Write points and normals into the block the mapper actually draws
+                part['mesh'] = mapper.dataset[i - 1]
+        
+        for part in self.parts:
+            orig = np.array(part['mesh'].points, dtype=np.float32)
+            center = part['original_center']
+            # One VTK bounds query per part, kept as a plain array
+            bounds = np.array(part['mesh'].bounds, dtype=np.float32)
             
-            self.original_positions[part['name']] = part['mesh'].points.copy()
-            self.original_centers[part['name']] = part['original_center'].copy()
-            self.original_bounds[part['name']] = part['mesh'].bounds
+            self.original_positions[part['name']] = orig
+            self.original_centers[part['name']] = center
+            self.original_bounds[part['name']] = bounds
+            
+            y_min, y_max = float(bounds[2]), float(bounds[3])
+            y_range = y_max - y_min if y_max != y_min else 1.0
+            inv_y_range = 1.0 / y_range
+            part['y_min'] = y_min
+            part['y_max'] = y_max
+            part['y_range'] = y_range
+            
+            # Static deformation basis (depends only on the rest geometry)
+            y_rel = orig[:, 1] - y_min
+            part['vectors'] = orig - center
+            part['y_norm'] = y_rel * np.float32(inv_y_range)
+            part['y_twist_norm'] = np.clip(
+                (orig[:, 1] - center[1]) * np.float32(2.0 * inv_y_range), 0, 1
+            )
+            part['longitudinal_basis'] = y_rel
+        
+        if self.parts:
+            self._build_handle_arrays()
+            self._bake_keyframes()
         
         # Lighting
         self.plotter.remove_all_lights()
@@ -424,33 +690,73 @@ class RealisticHeartCycle(QtWidgets.QMainWindow):
         
         print("✅ Scene ready")
     
+    def _build_handle_arrays(self):
+        """Concatenate the per-part rest geometry into flat arrays.
+        
+        Every part is driven by a single handle, so the skinning weights are
+        one-hot and stored as a vertex -> part index instead of a dense matrix.
+        """
+        offset = 0
+        for part in self.parts:
+            n = len(part['vectors'])
+            part['slice'] = slice(offset, offset + n)
+            offset += n
+            
+            # Scratch rows for the NumPy twist path (twisting regions only)
+            if HANDLE_COEF[part['region_id'], HANDLES.index('twist')].any():
+                part['twist_scratch'] = np.empty((4, n), dtype=np.float32)
+        
+        self._vectors_all = np.concatenate([p['vectors'] for p in self.parts]).astype(np.float32)
+        self._longitudinal_all = np.concatenate([p['longitudinal_basis'] for p in self.parts])
+        self._y_twist_all = np.concatenate([p['y_twist_norm'] for p in self.parts])
+        self._part_coef = HANDLE_COEF[[p['region_id'] for p in self.parts]]
+        self._centers = np.array([self.original_centers[p['name']] for p in self.parts], dtype=np.float32)
+        self._part_index = np.concatenate([
+            np.full(len(p['vectors']), i, dtype=np.int32) for i, p in enumerate(self.parts)
+        ])
+    
+    def _bake_keyframes(self):
+        """Evaluate the cycle at n_keyframes + 1 evenly spaced phases"""
+        if not self.parts:
+            return
+        
+        n_total = len(self._vectors_all)
+        keyframes = np.empty((self.n_keyframes + 1, n_total, 3), dtype=np.float32)
+        at_rest = np.empty((self.n_keyframes + 1, len(self.parts)), dtype=bool)
+        rest_handle = np.array([1.0, 0.0, 0.0, 0.0], dtype=np.float32)
+        for k in range(self.n_keyframes + 1):
+            self._deform_all(k / self.n_keyframes, keyframes[k])
+            at_rest[k] = np.all(self._handles_at(k / self.n_keyframes) == rest_handle, axis=1)
+        
+        # A part moves between keyframes k and k + 1 unless both are at rest
+        self._part_active = ~(at_rest[:-1] & at_rest[1:])
+        
+        self.keyframes = keyframes
+        self.worker.set_keyframes(keyframes)
+    
     def _toggle(self):
         if self.is_animating:
             self.is_animating = False
-            self.timer.stop()
+            self.stop_worker.emit()
             self.btn_play.setText("▶ START HEARTBEAT")
             self.status.setText("⏸ Paused")
         else:
             self.is_animating = True
-            self.timer.start()
+            self.start_worker.emit()
             self.btn_play.setText("⏸ PAUSE")
             self.status.setText("💓 Heart beating...")
     
-    def _update_cardiac_cycle(self):
-        """Complete cardiac cycle animation"""
-        if not self.is_animating:
+    def _update_cardiac_cycle(self, index, t, elapsed):
+        """Upload a frame blended by the worker (t: cycle position 0-1)"""
+        if not self.is_animating or not self.parts:
             return
+        start = time.perf_counter()
         
-        dt = 0.033
         beat_duration = 60.0 / self.heart_rate
-        self.time += dt
-        
-        # Cycle position (0-1)
-        t = (self.time % beat_duration) / beat_duration
         
         # Track beats
         if t < 0.02:
-            new_beat = int(self.time / beat_duration) + 1
+            new_beat = int(elapsed / beat_duration) + 1
             if new_beat != self.beat_count:
                 self.beat_count = new_beat
                 self.beat_label.setText(f"Beat: {self.beat_count}")
@@ -470,190 +776,177 @@ class RealisticHeartCycle(QtWidgets.QMainWindow):
             phase_name = "Diastole"
             phase_detail = "  \nHeart filling"
         
-        self.phase_label.setText(phase_name)
-        self.phase_detail.setText(phase_detail)
+        # Only touch the labels when the phase changes
+        if phase_name != self._phase_name:
+            self._phase_name = phase_name
+            self.phase_label.setText(phase_name)
+            self.phase_detail.setText(phase_detail)
+        
+        # Parts inert in this keyframe interval are skipped; a part that just
+        # came to rest is restored to its original positions once
+        active = self._part_active[min(int(t * self.n_keyframes), self.n_keyframes - 1)]
+        updated = []
+        
+        # Copy the finished buffer into the VTK point arrays
+        self.worker.mutex.lock()
+        try:
+            buf = self.worker.buffers[index]
+            for part, is_active in zip(self.parts, active):
+                if is_active:
+                    part['mesh'].points[:] = buf[part['slice']]
+                elif part['dirty']:
+                    part['mesh'].points[:] = self.original_positions[part['name']]
+                else:
+                    continue
+                part['dirty'] = is_active
+                updated.append(part)
+        finally:
+            self.worker.mutex.unlock()
         
-        # Update each part
-        for part in self.parts:
-            region = part['region']
-            orig = self.original_positions[part['name']]
-            center = self.original_centers[part['name']]
-            bounds = self.original_bounds[part['name']]
-            
-            new_points = orig.copy()
-            
-            # === ATRIA ===
-            if 'atrium' in region:
-                if t < 0.15:
-                    # Atrial contraction
-                    phase = t / 0.15
-                    contraction = 0.10 * self.global_amplitude * smooth_step(phase)
-                    vectors = orig - center
-                    scale = 1.0 - contraction
-                    new_points = center + vectors * scale
-                    
-                elif t > 0.45:
-                    # Filling (expansion)
-                    phase = (t - 0.45) / 0.55
-                    expansion = 0.06 * self.global_amplitude * smooth_step(phase)
-                    vectors = orig - center
-                    scale = 1.0 + expansion
-                    new_points = center + vectors * scale
-            
-            # === VENTRICLES ===
-            elif 'ventricle' in region:
-                if t >= 0.15 and t < 0.45:
-                    # Ventricular systole
-                    phase = (t - 0.15) / 0.30
-                    
-                    # Stronger contraction for left ventricle
-                    if 'left' in region:
-                        contraction = 0.18 * self.global_amplitude * smooth_step(phase)
-                    else:
-                        contraction = 0.14 * self.global_amplitude * smooth_step(phase)
-                    
-                    vectors = orig - center
-                    
-                    # Radial contraction
-                    scale = 1.0 - contraction
-                    new_points = center + vectors * scale
-                    
-                    # Apex-to-base motion
-                    y_min, y_max = bounds[2], bounds[3]
-                    y_range = y_max - y_min if y_max != y_min else 1.0
-                    if y_range > 0:
-                        y_normalized = (orig[:, 1] - y_min) / y_range
-                        longitudinal_shortening = 0.06 * self.global_amplitude * smooth_step(phase) * y_normalized * y_range
-                        new_points[:, 1] += longitudinal_shortening
-                    
-                    # Twisting motion
-                    if 'left' in region:
-                        twist_angle = -0.10 * self.global_amplitude * np.sin(phase * np.pi)
-                    else:
-                        twist_angle = -0.06 * self.global_amplitude * np.sin(phase * np.pi)
-                    
-                    # Apply twist if y-axis has variation
-                    if y_range > 0:
-                        y_norm_twist = (new_points[:, 1] - center[1]) / (y_range / 2)
-                        local_twist = twist_angle * np.clip(y_norm_twist, 0, 1)
-                        
-                        cos_t = np.cos(local_twist)
-                        sin_t = np.sin(local_twist)
-                        rel_x = new_points[:, 0] - center[0]
-                        rel_z = new_points[:, 2] - center[2]
-                        
-                        new_points[:, 0] = center[0] + rel_x * cos_t - rel_z * sin_t
-                        new_points[:, 2] = center[2] + rel_x * sin_t + rel_z * cos_t
-            
-            # === AV VALVES (Mitral, Tricuspid) ===
-            elif region in ['mitral_valve', 'tricuspid_valve']:
-                if t < 0.15:
-                    # Open during atrial systole
-                    phase = t / 0.15
-                    opening = 0.12 * self.global_amplitude * smooth_step(phase)
-                    displacement = opening * 3.0
-                    new_points[:, 1] += displacement
-                    
-                elif t >= 0.15 and t < 0.45:
-                    # Closed during ventricular systole
-                    closing = -0.08 * self.global_amplitude
-                    displacement = closing * 3.0
-                    new_points[:, 1] += displacement
-                    
-                elif t >= 0.45:
-                    # Gradually open during diastole
-                    phase = (t - 0.45) / 0.55
-                    opening = 0.10 * self.global_amplitude * smooth_step(phase)
-                    displacement = opening * 3.0
-                    new_points[:, 1] += displacement
-            
-            # === SEMILUNAR VALVES (Aortic, Pulmonary) ===
-            elif region in ['aortic_valve', 'pulmonary_valve']:
-                if t >= 0.15 and t < 0.45:
-                    # Open during ventricular systole
-                    phase = (t - 0.15) / 0.30
-                    opening = 0.15 * self.global_amplitude * smooth_step(phase)
-                    
-                    vectors = orig - center
-                    scale = 1.0 + opening * 0.2
-                    new_points = center + vectors * scale
-                    
-                    displacement = opening * 2.5
-                    new_points[:, 1] += displacement
-            
-            # === PAPILLARY MUSCLES ===
-            elif 'papillary' in region:
-                if t >= 0.15 and t < 0.45:
-                    # Contract with ventricles
-                    phase = (t - 0.15) / 0.30
-                    contraction = 0.12 * self.global_amplitude * smooth_step(phase)
-                    vectors = orig - center
-                    scale = 1.0 - contraction
-                    new_points = center + vectors * scale
+        for part in updated:
+            part['mesh'].compute_normals(auto_orient_normals=False, consistent_normals=False, inplace=True)
+        
+        self._update_cost = time.perf_counter() - start
+        self._request_render()
+    
+    @staticmethod
+    def _phase_curves(t):
+        """Values of PHASE_CURVES at cycle time t"""
+        atrial = systolic = diastolic = twist = pulse = hold = 0.0
+        
+        if t < 0.15:
+            atrial = smooth_step_lut(t / 0.15)
+        elif t < 0.45:
+            phase = (t - 0.15) / 0.30
+            systolic = smooth_step_lut(phase)
+            twist = np.sin(phase * np.pi)
+            hold = 1.0
+        else:
+            diastolic = smooth_step_lut((t - 0.45) / 0.55)
+        
+        if 0.15 <= t < 0.50:
+            pulse = np.sin((t - 0.15) / 0.35 * np.pi)
+        
+        return np.array([atrial, systolic, diastolic, twist, pulse, hold], dtype=np.float32)
+    
+    def _handles_at(self, t):
+        """(n_parts, 4) array of handle parameters at cycle time t"""
+        handles = self._part_coef @ self._phase_curves(t)
+        handles *= self.global_amplitude
+        handles[:, 0] += 1.0
+        return handles
+    
+    def _deform_all(self, t, out):
+        """Deform every vertex of every part into out (n_total x 3)"""
+        handles = self._handles_at(t)
+        idx = self._part_index
+        scale, dy, longitudinal, twist = handles.T
+        
+        if HAS_NUMBA:
+            _deform_kernel(self._vectors_all, self._centers, idx, self._longitudinal_all,
+                           self._y_twist_all, np.ascontiguousarray(scale), np.ascontiguousarray(dy),
+                           np.ascontiguousarray(longitudinal), np.ascontiguousarray(twist), out)
+            return out
+        
+        # Per-part slices of out are written in place, no per-vertex gathers
+        for p, part in enumerate(self.parts):
+            sl = part['slice']
+            o = out[sl]
             
-            # === CHORDAE TENDINEAE ===
-            elif 'chordae' in region:
-                if t >= 0.15 and t < 0.45:
-                    # Tension during ventricular systole
-                    phase = (t - 0.15) / 0.30
-                    tension = 0.10 * self.global_amplitude * smooth_step(phase)
-                    displacement = tension * 2.5
-                    new_points[:, 1] -= displacement
+            # Radial scale about the part center
+            np.multiply(self._vectors_all[sl], scale[p], out=o)
             
-            # === SEPTUM ===
-            elif 'septum' in region:
-                if t >= 0.15 and t < 0.45:
-                    # Moves with ventricles
-                    phase = (t - 0.15) / 0.30
-                    motion = 0.08 * self.global_amplitude * smooth_step(phase)
-                    vectors = orig - center
-                    scale = 1.0 - motion * 0.5
-                    new_points = center + vectors * scale
+            # Twist (ventricles only) about the part center
+            if twist[p]:
+                local_twist, cos_t, sin_t, tmp = part['twist_scratch']
+                np.multiply(self._y_twist_all[sl], twist[p], out=local_twist)
+                
+                # |twist| stays below ~0.2 rad, so low-order Taylor terms suffice
+                np.multiply(local_twist, local_twist, out=cos_t)
+                np.multiply(cos_t, -1.0 / 6.0, out=sin_t)
+                sin_t += 1.0
+                sin_t *= local_twist
+                cos_t *= -0.5
+                cos_t += 1.0
+                
+                # x' = x cos - z sin, z' = x sin + z cos
+                np.multiply(o[:, 2], sin_t, out=tmp)
+                np.multiply(o[:, 0], sin_t, out=local_twist)
+                o[:, 0] *= cos_t
+                o[:, 0] -= tmp
+                o[:, 2] *= cos_t
+                o[:, 2] += local_twist
             
-            # === VESSELS ===
-            elif region in ['aorta', 'pulmonary_artery', 'vena_cava', 'vessel']:
-                if t >= 0.15 and t < 0.50:
-                    # Pulse wave
-                    phase = (t - 0.15) / 0.35
-                    
-                    pulse = 0.06 * self.global_amplitude * np.sin(phase * np.pi)
-                    vectors = orig - center
-                    
-                    # Ensure pulse is a scalar
-                    pulse_scalar = float(pulse)
-                    scale = 1.0 + pulse_scalar
-                    new_points = center + vectors * scale
+            o += self._centers[p]
             
-            # Update mesh
-            part['mesh'].points = new_points
-            part['mesh'].compute_normals(auto_orient_normals=True, inplace=True)
+            # Apex-to-base / valve shift
+            if dy[p]:
+                o[:, 1] += dy[p]
+            if longitudinal[p]:
+                o[:, 1] += longitudinal[p] * self._longitudinal_all[sl]
+        
+        return out
+    
+    def _request_render(self):
+        """Queue a render; inside the render interval it is deferred, not dropped"""
+        if self._render_pending:
+            return
         
+        # Render from the event loop so pending input is handled first. A deferred
+        # render draws whatever the meshes hold when it fires, so it is never stale
+        self._render_pending = True
+        wait = self.render_interval - (time.perf_counter() - self._last_render)
+        QtCore.QTimer.singleShot(max(0, int(wait * 1000)), self._render_now)
+    
+    def _render_now(self):
+        self._render_pending = False
+        start = time.perf_counter()
         self.plotter.render()
+        self._last_render = time.perf_counter()
+        
+        # Smoothed update + render cost decides how far apart renders are spaced
+        cost = self._update_cost + self._last_render - start
+        self._frame_cost += 0.2 * (cost - self._frame_cost)
+        if self._frame_cost > self.frame_budget:
+            self.render_interval = max(self.slow_render_interval, self._frame_cost)
+        else:
+            self.render_interval = 0.0
     
     def _reset(self):
         """Reset to original state"""
         for part in self.parts:
-            part['mesh'].points = self.original_positions[part['name']].copy()
-            part['mesh'].compute_normals(auto_orient_normals=True, inplace=True)
+            part['mesh'].points[:] = self.original_positions[part['name']]
+            part['mesh'].compute_normals(auto_orient_normals=False, consistent_normals=False, inplace=True)
+            part['dirty'] = False
         
-        self.time = 0.0
+        self.worker.reset()
         self.beat_count = 0
         self.beat_label.setText("Beat: 0")
         self.phase_label.setText("Ready")
         self.phase_detail.setText("...")
+        self._phase_name = None
         self.plotter.render()
         self.status.setText("🔄 Reset")
     
     def _update_amplitude(self, val):
         self.global_amplitude = val / 100.0
         self.amp_label.setText(f"{val}%")
+        self.bake_timer.start()
     
     def _update_heart_rate(self, val):
         self.heart_rate = val
+        self.worker.heart_rate = val
         self.hr_label.setText(f"{val} BPM")
         self.bpm_label.setText(f"{val} BPM")
 
 
+    def closeEvent(self, event):
+        self.stop_worker.emit()
+        self.worker_thread.quit()
+        self.worker_thread.wait()
+        super().closeEvent(event)
+
+
 def main():
     print("\n" + "="*70)
     print("🫀 REALISTIC HEART CARDIAC CYCLE ANIMATION")
@@ -682,11 +975,11 @@ def main():
     ]
     
     parts_folder = None
+    obj_files = []
     for folder_name in possible_folders:
         path = os.path.join(current_dir, folder_name)
         if os.path.isdir(path):
-            obj_files = glob.glob(os.path.join(path, "*.obj"))
-            obj_files.extend(glob.glob(os.path.join(path, "*.OBJ")))
+            obj_files = find_obj_files(path)
             if obj_files:
                 parts_folder = path
                 break
@@ -704,8 +997,7 @@ def main():
         return
     
     print(f"\n✅ Found heart parts folder: {parts_folder}")
-    obj_count = len(glob.glob(os.path.join(parts_folder, "*.obj")))
-    print(f"✅ Found {obj_count} OBJ files")
+    print(f"✅ Found {len(obj_files)} OBJ files")
     print("🚀 Launching realistic heart animation...\n")
     
     app = QtWidgets.QApplication(sys.argv)
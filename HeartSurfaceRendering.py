@@ -1,5 +1,7 @@
 import pyvista as pv
 import numpy as np
+import vtk
+import os
 
 # تحميل ملف .obj
 mesh = pv.read('heart_assembled (1).obj')
@@ -8,12 +10,15 @@ mesh = pv.read('heart_assembled (1).obj')
 mesh = mesh.clean()
 
 # حساب الـ normals
-mesh = mesh.compute_normals(cell_normals=True, point_normals=True, 
-                            split_vertices=False, flip_normals=False)
+# (point normals فقط - الـ cell normals مش مستخدمة في الـ smooth shading)
+mesh = mesh.compute_normals(cell_normals=False, point_normals=True, 
+                            split_vertices=False, flip_normals=False,
+                            feature_angle=180)
 
 # إنشاء plotter
-plotter = pv.Plotter(window_size=[1400, 1000])
-plotter.enable_anti_aliasing('ssaa')
+# lighting='none': الإضاءة كلها من الـ 4 lights تحت بس (من غير الـ light kit الافتراضي)
+plotter = pv.Plotter(window_size=[1400, 1000], lighting='none')
+plotter.enable_anti_aliasing('fxaa')
 
 # ==============================================================
 # الطريقة الصحيحة: نلون كل حاجة بلون القلب الطبيعي
@@ -31,10 +36,7 @@ plotter.add_mesh(mesh,
                 ambient=0.25,           # إضاءة محيطية معتدلة
                 diffuse=0.65,           # انتشار الضوء
                 specular=0.4,           # لمعان خفيف (القلب مش لامع قوي)
-                specular_power=20,      # تركيز اللمعان
-                pbr=True,               # Physically Based Rendering
-                metallic=0.1,           # معدني شوية جداً
-                roughness=0.7)          # خشونة عالية (سطح عضوي)
+                specular_power=20)      # تركيز اللمعان (Phong - أخف من PBR وبنفس الشكل تقريباً)
 
 # ==============================================================
 # إضاءة واقعية جداً (زي studio lighting)
@@ -71,7 +73,11 @@ plotter.add_light(top_light)
 # ==============================================================
 # خلفية احترافية
 # ==============================================================
-plotter.set_background('#F5F5F5', top='#E8E8E8')  # رمادي فاتح gradient
+# رمادي فاتح gradient - متحسب مرة واحدة كـ texture (من فوق #E8E8E8 لتحت #F5F5F5)
+gradient = np.linspace([0xE8, 0xE8, 0xE8], [0xF5, 0xF5, 0xF5], 256).astype(np.uint8).reshape(256, 1, 3)
+background = pv.Texture(gradient)
+plotter.renderer.SetBackgroundTexture(background)
+plotter.renderer.TexturedBackgroundOn()
 
 # ==============================================================
 # إعدادات الكاميرا
@@ -112,8 +118,14 @@ print("="*70)
 print(f"\n📊 Model Statistics:")
 print(f"   Vertices: {mesh.n_points:,}")
 print(f"   Faces: {mesh.n_cells:,}")
-print(f"   Surface Area: {mesh.area:.2f} mm²")
-print(f"   Volume: {mesh.volume:.2f} mm³")
+
+# المساحة والحجم في pass واحد (vtkMassProperties) - بس لو MEDVIZ_VERBOSE متفعّل
+if os.environ.get('MEDVIZ_VERBOSE'):
+    mass = vtk.vtkMassProperties()
+    mass.SetInputData(mesh.triangulate())
+    mass.Update()
+    print(f"   Surface Area: {mass.GetSurfaceArea():.2f} mm²")
+    print(f"   Volume: {mass.GetVolume():.2f} mm³")
 
 bounds = mesh.bounds
 dims = [bounds[1]-bounds[0], bounds[3]-bounds[2], bounds[5]-bounds[4]]
@@ -4,6 +4,40 @@ from PIL import Image, ImageTk
 import os
 import sys
 import subprocess
+import pickle
+import re
+import json
+
+# Long-lived script runner (see worker.py) and its end-of-run marker
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'worker.py')
+WORKER_DONE = "__MEDVIZ_DONE__"
+
+# Filesystem -> system mapping cache, keyed by directory path and mtime
+MAPPING_CACHE = os.path.join(os.path.expanduser('~'), '.cache', 'medviz_map.pkl')
+
+FEATURE_PATTERNS = {
+    "Surface Rendering": ["surfacerendering", "rendering"],
+    "Clipping Plans": ["clipping", "clippingplans"],
+    "Curved MPR": ["curved", "mpr", "curvedmpr"],
+    "Focus Navigation": ["focus", "navigation", "focusnavigation"],
+    "Moving Stuff Illustration": ["moving", "illustration", "movingstuff"],
+    "Fly-through Navigation": ["flythrough", "fly"]
+}
+
+# Lowercased filename keywords -> system, checked in order so the first
+# system listed wins when a name matches several
+SYSTEM_KEYWORDS = (
+    (("heart", "aorta"), "Cardiovascular System"),
+    (("brain",), "Nervous System"),
+    (("bone", "skeleton", "muscle"), "Musculoskeletal System"),
+    (("tooth", "dental", "mouth"), "Mouth/Dental System"),
+)
+
+# One alternation per feature instead of a loop over its patterns
+FEATURE_RES = {
+    feature: re.compile('|'.join(map(re.escape, patterns)))
+    for feature, patterns in FEATURE_PATTERNS.items()
+}
 
 class MedicalVisualizationGUI:
     def __init__(self, root):
@@ -65,63 +99,133 @@ class MedicalVisualizationGUI:
             ]
         }
         
+        # Hover colors for the fixed palette (system colors + feature buttons)
+        self._lighten_cache = {}
+        for color in {info["color"] for info in self.systems.values()} | {'#00d4ff', '#00aa66', '#0078d4'}:
+            self._lighten_cache[color] = self._compute_lighten(color)
+        
         self.file_to_system_mapping = self.create_file_system_mapping()
         self.selected_system = None
-        self.images = []
+        self._image_cache = {}
+        
+        # Menus are built once and swapped with pack/pack_forget
+        self._views = {}
+        self._current = None
+        
+        self._worker = None
+        self.start_worker()
         
         self.show_main_menu()
     
+    def start_worker(self):
+        env = dict(os.environ, PYTHONIOENCODING='utf-8')
+        self._worker = subprocess.Popen(
+            [sys.executable, '-u', WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=os.getcwd(),
+            env=env
+        )
+    
+    def stop_worker(self):
+        if self._worker and self._worker.poll() is None:
+            self._worker.stdin.close()
+            self._worker.wait()
+        self._worker = None
+    
+    def run_in_worker(self, file_name):
+        if self._worker is None or self._worker.poll() is not None:
+            self.start_worker()
+        
+        request = json.dumps({'file': os.path.abspath(file_name)}) + "\n"
+        self._worker.stdin.write(request.encode('utf-8'))
+        self._worker.stdin.flush()
+        
+        # Echo the script's output until it reports completion
+        for raw in self._worker.stdout:
+            line = raw.decode('utf-8', errors='replace').rstrip('\r\n')
+            if line == WORKER_DONE:
+                return
+            print(line)
+        
+        raise RuntimeError("Feature worker exited unexpectedly")
+    
     def create_file_system_mapping(self):
+        cwd = os.getcwd()
+        cache_key = (cwd, os.stat(cwd).st_mtime_ns)
+        
+        # Reuse the last scan while the directory is unchanged
+        try:
+            with open(MAPPING_CACHE, 'rb') as f:
+                cached = pickle.load(f)
+            if cached['key'] == cache_key:
+                self._feature_index = cached['features']
+                return cached['mapping']
+        except Exception:
+            pass
+        
         mapping = {
             "Cardiovascular System": [],
             "Nervous System": [],
             "Musculoskeletal System": [],
             "Mouth/Dental System": []
         }
+        lowered = {}
+        
+        with os.scandir(cwd) as entries:
+            for entry in entries:
+                file = entry.name
+                if file.endswith('.py') and file != 'main_gui.py':
+                    file_lower = file.lower()
+                    for keywords, system in SYSTEM_KEYWORDS:
+                        if any(k in file_lower for k in keywords):
+                            mapping[system].append(file)
+                            lowered[file] = file_lower
+                            break
+        
+        # system -> feature -> first matching file
+        self._feature_index = {}
+        for system, files in mapping.items():
+            index = self._feature_index[system] = {}
+            for feature, regex in FEATURE_RES.items():
+                for file in files:
+                    if regex.search(lowered[file]):
+                        index[feature] = file
+                        break
         
-        for file in os.listdir('.'):
-            if file.endswith('.py') and file != 'main_gui.py':
-                file_lower = file.lower()
-                if 'heart' in file_lower or 'aorta' in file_lower:
-                    mapping["Cardiovascular System"].append(file)
-                elif 'brain' in file_lower:
-                    mapping["Nervous System"].append(file)
-                elif 'bone' in file_lower or 'skeleton' in file_lower or 'muscle' in file_lower:
-                    mapping["Musculoskeletal System"].append(file)
-                elif 'tooth' in file_lower or 'dental' in file_lower or 'mouth' in file_lower:
-                    mapping["Mouth/Dental System"].append(file)
+        try:
+            os.makedirs(os.path.dirname(MAPPING_CACHE), exist_ok=True)
+            with open(MAPPING_CACHE, 'wb') as f:
+                pickle.dump({'key': cache_key, 'mapping': mapping,
+                             'features': self._feature_index}, f)
+        except Exception:
+            pass
         
         return mapping
     
     def get_feature_file(self, system_name, feature_name):
-        feature_patterns = {
-            "Surface Rendering": ["surfacerendering", "rendering"],
-            "Clipping Plans": ["clipping", "clippingplans"],
-            "Curved MPR": ["curved", "mpr", "curvedmpr"],
-            "Focus Navigation": ["focus", "navigation", "focusnavigation"],
-            "Moving Stuff Illustration": ["moving", "illustration", "movingstuff"],
-            "Fly-through Navigation": ["flythrough", "fly"]
-        }
-        
-        pattern = feature_patterns.get(feature_name, [])
-        system_files = self.file_to_system_mapping.get(system_name, [])
-        
-        for file in system_files:
-            file_lower = file.lower()
-            for p in pattern:
-                if p in file_lower:
-                    return file
-        return None
+        return self._feature_index.get(system_name, {}).get(feature_name)
     
     def load_system_image(self, image_file, size=(110, 110)):
+        # Decoded once per (file, size); the cache also keeps Tk's reference alive
+        key = (image_file, tuple(size))
+        photo = self._image_cache.get(key)
+        if photo is not None:
+            return photo
+        
+        photo = None
         try:
             if os.path.exists(image_file):
                 img = Image.open(image_file)
                 img = img.resize(size, Image.Resampling.LANCZOS)
-                return ImageTk.PhotoImage(img)
+                photo = ImageTk.PhotoImage(img)
         except:
             pass
-        return self.create_placeholder_image(size)
+        if photo is None:
+            photo = self.create_placeholder_image(size)
+        
+        self._image_cache[key] = photo
+        return photo
     
     def create_placeholder_image(self, size=(110, 110)):
         img = Image.new('RGB', size, (42, 47, 74))
@@ -130,16 +234,30 @@ class MedicalVisualizationGUI:
         draw.rectangle([10, 10, size[0]-10, size[1]-10], outline=(255, 255, 255), width=2)
         return ImageTk.PhotoImage(img)
     
-    def clear_window(self):
-        for widget in self.root.winfo_children():
-            widget.destroy()
-        self.images.clear()
+    def _hide_current(self):
+        if self._current is not None:
+            self._current.pack_forget()
+            self._current = None
+    
+    def _show_view(self, key):
+        """Show a cached view; returns False if it has not been built yet"""
+        self._hide_current()
+        view = self._views.get(key)
+        if view is None:
+            return False
+        view.pack(fill=tk.BOTH, expand=True)
+        self._current = view
+        return True
     
     def show_main_menu(self):
-        self.clear_window()
+        if self._show_view('main'):
+            return
+        
+        # Built unmapped and packed once at the end: one geometry pass
+        view = tk.Frame(self.root, bg=self.colors["bg_dark"])
         
         # Header
-        header = tk.Frame(self.root, bg=self.colors["bg_header"], height=100)
+        header = tk.Frame(view, bg=self.colors["bg_header"], height=100)
         header.pack(fill=tk.X, side=tk.TOP)
         header.pack_propagate(False)
         
@@ -153,7 +271,7 @@ class MedicalVisualizationGUI:
         title.pack(pady=28)
         
         # Subtitle
-        subtitle_frame = tk.Frame(self.root, bg=self.colors["bg_dark"], height=50)
+        subtitle_frame = tk.Frame(view, bg=self.colors["bg_dark"], height=50)
         subtitle_frame.pack(fill=tk.X, side=tk.TOP)
         subtitle_frame.pack_propagate(False)
         
@@ -167,28 +285,26 @@ class MedicalVisualizationGUI:
         subtitle.pack(pady=15)
         
         # Main container
-        main_container = tk.Frame(self.root, bg=self.colors["bg_dark"])
+        main_container = tk.Frame(view, bg=self.colors["bg_dark"])
         main_container.pack(fill=tk.BOTH, expand=True, side=tk.TOP)
         
-        # Content frame - centered
-        content = tk.Frame(main_container, bg=self.colors["bg_dark"])
+        # Content canvas - centered; cards are drawn items, not widgets
+        content = tk.Canvas(main_container, bg=self.colors["bg_dark"], highlightthickness=0)
         content.place(relx=0.5, rely=0.5, anchor=tk.CENTER, width=1200, height=520)
+        content.tag_bind('card', '<Enter>', self._on_card_enter)
+        content.tag_bind('card', '<Leave>', self._on_card_leave)
+        content.tag_bind('explore', '<Button-1>', self._on_card_click)
+        self._cards = {}
         
-        # Create all 4 cards - SAME SIZE
+        # Create all 4 cards - SAME SIZE, in a uniform 2x2 grid of 600x260 cells
         systems_list = list(self.systems.items())
         for idx, (sys_name, sys_info) in enumerate(systems_list):
             row = idx // 2
             col = idx % 2
-            self.create_system_card(content, sys_name, sys_info, row, col)
-        
-        # Grid configuration - uniform
-        content.grid_columnconfigure(0, weight=1, uniform="col")
-        content.grid_columnconfigure(1, weight=1, uniform="col")
-        content.grid_rowconfigure(0, weight=1, uniform="row")
-        content.grid_rowconfigure(1, weight=1, uniform="row")
+            self.create_system_card(content, idx, sys_name, sys_info, row, col)
         
         # Footer
-        footer = tk.Frame(self.root, bg=self.colors["bg_header"], height=45)
+        footer = tk.Frame(view, bg=self.colors["bg_header"], height=45)
         footer.pack(side=tk.BOTTOM, fill=tk.X)
         footer.pack_propagate(False)
         
@@ -200,88 +316,106 @@ class MedicalVisualizationGUI:
             fg=self.colors["text_muted"]
         )
         footer_text.pack(pady=14)
+        
+        self._views['main'] = view
+        self._show_view('main')
     
-    def create_system_card(self, parent, sys_name, sys_info, row, col):
+    def create_system_card(self, canvas, idx, sys_name, sys_info, row, col):
         color = sys_info["color"]
         image_file = sys_info["image"]
-        
-        # Card container
-        card_container = tk.Frame(parent, bg=self.colors["bg_dark"])
-        card_container.grid(row=row, column=col, sticky="nsew", padx=8, pady=8)
-        
-        # Card - ALL SAME SIZE: 560x230
-        card = tk.Frame(
-            card_container,
-            bg=self.colors["card_bg"],
-            highlightthickness=2,
-            highlightbackground=self.colors["card_border"],
-            width=560,
-            height=230
+        tag = f"sys{idx}"
+        
+        # Card - ALL SAME SIZE: 560x230, centered in its cell
+        x0 = col * 600 + 20
+        y0 = row * 260 + 15
+        cx = x0 + 280
+        
+        rect = canvas.create_rectangle(
+            x0, y0, x0 + 560, y0 + 230,
+            fill=self.colors["card_bg"],
+            outline=self.colors["card_border"],
+            width=2,
+            tags=('card', tag)
         )
-        card.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
-        card.pack_propagate(False)
         
         # Image
         img = self.load_system_image(image_file, (110, 110))
-        self.images.append(img)
-        
-        img_label = tk.Label(card, image=img, bg=self.colors["card_bg"])
-        img_label.pack(pady=(15, 8))
+        canvas.create_image(cx, y0 + 15, image=img, anchor=tk.N, tags=('card', tag))
         
         # System name
-        name_label = tk.Label(
-            card,
+        canvas.create_text(
+            cx, y0 + 150,
             text=sys_name,
             font=("Segoe UI", 17, "bold"),
-            bg=self.colors["card_bg"],
-            fg=self.colors["text_primary"]
+            fill=self.colors["text_primary"],
+            tags=('card', tag)
         )
-        name_label.pack(pady=(0, 4))
         
         # Feature count
         count = len(self.file_to_system_mapping.get(sys_name, []))
         count_text = f"{count} features available" if count > 0 else "Coming Soon"
         
-        count_label = tk.Label(
-            card,
+        canvas.create_text(
+            cx, y0 + 176,
             text=count_text,
             font=("Segoe UI", 9),
-            bg=self.colors["card_bg"],
-            fg=self.colors["text_muted"]
+            fill=self.colors["text_muted"],
+            tags=('card', tag)
         )
-        count_label.pack(pady=(0, 10))
         
         # EXPLORE button
-        explore_btn = tk.Button(
-            card,
+        btn = canvas.create_rectangle(
+            cx - 80, y0 + 190, cx + 80, y0 + 222,
+            fill=color,
+            width=0,
+            tags=('card', 'explore', tag)
+        )
+        canvas.create_text(
+            cx, y0 + 206,
             text="EXPLORE →",
             font=("Segoe UI", 11, "bold"),
-            bg=color,
-            fg="white",
-            activebackground=color,
-            activeforeground="white",
-            relief=tk.FLAT,
-            cursor="hand2",
-            bd=0,
-            width=15,
-            command=lambda s=sys_name: self.select_system(s)
+            fill="white",
+            tags=('card', 'explore', tag)
         )
-        explore_btn.pack(ipady=6)
         
-        # Hover effects
-        def on_enter(e):
-            card.config(highlightbackground=color, highlightthickness=3)
-            explore_btn.config(bg=self.lighten_color(color))
-        
-        def on_leave(e):
-            card.config(highlightbackground=self.colors["card_border"], highlightthickness=2)
-            explore_btn.config(bg=color)
-        
-        for widget in [card, img_label, name_label, count_label]:
-            widget.bind("<Enter>", on_enter)
-            widget.bind("<Leave>", on_leave)
+        self._cards[tag] = {'name': sys_name, 'color': color, 'rect': rect, 'btn': btn}
+    
+    def _current_card(self, canvas):
+        for tag in canvas.gettags('current'):
+            if tag in self._cards:
+                return tag, self._cards[tag]
+        return None, None
+    
+    def _on_card_enter(self, event):
+        canvas = event.widget
+        tag, card = self._current_card(canvas)
+        if card is None:
+            return
+        canvas.itemconfig(card['rect'], outline=card['color'], width=3)
+        canvas.itemconfig(card['btn'], fill=self.lighten_color(card['color']))
+        canvas.config(cursor="hand2" if 'explore' in canvas.gettags('current') else "")
+    
+    def _on_card_leave(self, event):
+        canvas = event.widget
+        tag, card = self._current_card(canvas)
+        if card is None:
+            return
+        canvas.itemconfig(card['rect'], outline=self.colors["card_border"], width=2)
+        canvas.itemconfig(card['btn'], fill=card['color'])
+        canvas.config(cursor="")
+    
+    def _on_card_click(self, event):
+        tag, card = self._current_card(event.widget)
+        if card is not None:
+            self.select_system(card['name'])
     
     def lighten_color(self, color):
+        lightened = self._lighten_cache.get(color)
+        if lightened is None:
+            lightened = self._lighten_cache[color] = self._compute_lighten(color)
+        return lightened
+    
+    def _compute_lighten(self, color):
         color = color.lstrip('#')
         r, g, b = tuple(int(color[i:i+2], 16) for i in (0, 2, 4))
         r = min(255, int(r * 1.25))
@@ -295,12 +429,17 @@ class MedicalVisualizationGUI:
         self.show_features_menu()
     
     def show_features_menu(self):
-        self.clear_window()
+        key = f"feat:{self.selected_system}"
+        if self._show_view(key):
+            return
         
         color = self.systems[self.selected_system]["color"]
         
+        # Built unmapped and packed once at the end: one geometry pass
+        view = tk.Frame(self.root, bg=self.colors["bg_dark"])
+        
         # Header
-        header = tk.Frame(self.root, bg=self.colors["bg_header"], height=95)
+        header = tk.Frame(view, bg=self.colors["bg_header"], height=95)
         header.pack(fill=tk.X, side=tk.TOP)
         header.pack_propagate(False)
         
@@ -332,7 +471,7 @@ class MedicalVisualizationGUI:
         title.pack(pady=28)
         
         # Subtitle
-        subtitle_frame = tk.Frame(self.root, bg=self.colors["bg_dark"], height=50)
+        subtitle_frame = tk.Frame(view, bg=self.colors["bg_dark"], height=50)
         subtitle_frame.pack(fill=tk.X, side=tk.TOP)
         subtitle_frame.pack_propagate(False)
         
@@ -346,7 +485,7 @@ class MedicalVisualizationGUI:
         subtitle.pack(pady=15)
         
         # Main container
-        main_container = tk.Frame(self.root, bg=self.colors["bg_dark"])
+        main_container = tk.Frame(view, bg=self.colors["bg_dark"])
         main_container.pack(fill=tk.BOTH, expand=True)
         
         # Content
@@ -375,6 +514,9 @@ class MedicalVisualizationGUI:
         
         main.grid_columnconfigure(0, weight=1)
         main.grid_columnconfigure(1, weight=1)
+        
+        self._views[key] = view
+        self._show_view(key)
     
     def create_feature_section(self, parent, title, features, title_color, btn_color):
         frame = tk.LabelFrame(
@@ -442,7 +584,7 @@ class MedicalVisualizationGUI:
         self.root.withdraw()
         
         try:
-            subprocess.run([sys.executable, file_name], cwd=os.getcwd())
+            self.run_in_worker(file_name)
         except Exception as e:
             messagebox.showerror("Error", f"Error:\n{str(e)}")
         finally:
@@ -464,6 +606,7 @@ def main():
     
     app = MedicalVisualizationGUI(root)
     root.mainloop()
+    app.stop_worker()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,11 +2,26 @@ import nibabel as nib
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button, Slider
-from scipy.ndimage import map_coordinates, zoom, binary_fill_holes, binary_dilation
+from matplotlib.transforms import Bbox
+from matplotlib.colors import Normalize
+from scipy.ndimage import map_coordinates, zoom, binary_fill_holes, maximum_filter
 from scipy.interpolate import splprep, splev
 import time
 from pathlib import Path
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import cupy as cp
+    from cupyx.scipy import ndimage as cupy_ndimage
+    HAS_CUPY = True
+except ImportError:
+    HAS_CUPY = False
+
 try:
     import trimesh
     HAS_TRIMESH = True
@@ -20,6 +35,20 @@ except ImportError:
     HAS_SKIMAGE = False
 
 
+def fill_and_dilate_coarse(volume, size):
+    """
+    ملء الثقوب والتوسيع بنصف الدقة (8x أقل voxels) ثم الرجوع للحجم الأصلي
+    """
+    pad = [(0, n % 2) for n in volume.shape]
+    v = np.pad(volume, pad)
+    # any() على بلوكات 2x2x2 يحافظ على السطح مقفول
+    small = v.reshape(v.shape[0] // 2, 2, v.shape[1] // 2, 2, v.shape[2] // 2, 2).any(axis=(1, 3, 5))
+    small = binary_fill_holes(small)
+    small = maximum_filter(small, size=size, mode='constant', cval=0)
+    full = small.repeat(2, axis=0).repeat(2, axis=1).repeat(2, axis=2)
+    return full[:volume.shape[0], :volume.shape[1], :volume.shape[2]]
+
+
 def obj_to_volume_advanced(folder_path, resolution=256):
     """
     تحويل OBJ إلى volume 3D بطريقة محسّنة جداً
@@ -62,21 +91,24 @@ def obj_to_volume_advanced(folder_path, resolution=256):
     # إنشاء voxel grid محسّن
     print("⚙ Voxelizing mesh (this may take a moment)...")
     
-    # الطريقة 1: استخدام trimesh voxelization
+    # الطريقة 1: voxelization مباشر للمثلثات (numba)، أو trimesh لو مش متاح
     try:
-        voxelized = mesh.voxelized(pitch=voxel_size)
-        volume = voxelized.matrix.astype(float)
+        if HAS_NUMBA:
+            dims = np.round(extent / voxel_size).astype(int) + 1
+            surface = np.zeros(dims, dtype=np.uint8)
+            _voxelize_surface(np.asarray(mesh.triangles, dtype=np.float64),
+                              np.asarray(bounds[0], dtype=np.float64), float(voxel_size), surface)
+            volume = surface.view(bool)
+        else:
+            voxelized = mesh.voxelized(pitch=voxel_size)
+            volume = voxelized.matrix.astype(bool)
         
         print(f"✓ Initial voxelization: {volume.sum():.0f} filled voxels")
         
-        # ملء الثقوب الداخلية
-        print("🔧 Filling internal holes...")
-        volume = binary_fill_holes(volume).astype(float)
-        
-        # توسيع خفيف لربط الأجزاء المنفصلة
-        print("🔧 Connecting components...")
-        structure = np.ones((3, 3, 3))
-        volume = binary_dilation(volume, structure=structure, iterations=3).astype(float)
+        # ملء الثقوب الداخلية + توسيع خفيف لربط الأجزاء المنفصلة
+        # (بنصف الدقة: بلوك 2x2x2 + مكعب 3 يساوي تقريباً مكعب 7x7x7 بالدقة الكاملة)
+        print("🔧 Filling internal holes and connecting components...")
+        volume = fill_and_dilate_coarse(volume, size=3).astype(np.float32)
         
         print(f"✓ After processing: {volume.sum():.0f} filled voxels")
         
@@ -90,19 +122,17 @@ def obj_to_volume_advanced(folder_path, resolution=256):
         
         # تحويل النقاط إلى indices
         normalized = (points - bounds[0]) / voxel_size
-        indices = normalized.astype(int)
+        indices = normalized.astype(np.int32)
         
         # إنشاء volume
-        volume = np.zeros(grid_dims, dtype=float)
+        volume = np.zeros(grid_dims, dtype=bool)
         
-        for idx in indices:
-            if all(0 <= idx[i] < grid_dims[i] for i in range(3)):
-                volume[idx[0], idx[1], idx[2]] = 1.0
+        inside = np.all((indices >= 0) & (indices < grid_dims), axis=1)
+        flat = np.ravel_multi_index(indices[inside].T, volume.shape)
+        volume.reshape(-1)[flat] = True
         
         # ملء وتوسيع
-        volume = binary_fill_holes(volume).astype(float)
-        structure = np.ones((3, 3, 3))
-        volume = binary_dilation(volume, structure=structure, iterations=4).astype(float)
+        volume = fill_and_dilate_coarse(volume, size=5).astype(np.float32)
     
     print(f"\n✅ Final volume: {volume.shape}")
     print(f"   Filled: {100 * volume.sum() / volume.size:.2f}%")
@@ -113,6 +143,93 @@ def obj_to_volume_advanced(folder_path, resolution=256):
     return volume
 
 
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def _voxelize_surface(triangles, origin, pitch, volume):
+        """Mark every voxel touched by a triangle, sampling each one at pitch/2"""
+        nx, ny, nz = volume.shape
+        step = 0.5 * pitch
+        for t in prange(triangles.shape[0]):
+            ax, ay, az = triangles[t, 0, 0], triangles[t, 0, 1], triangles[t, 0, 2]
+            e1x = triangles[t, 1, 0] - ax
+            e1y = triangles[t, 1, 1] - ay
+            e1z = triangles[t, 1, 2] - az
+            e2x = triangles[t, 2, 0] - ax
+            e2y = triangles[t, 2, 1] - ay
+            e2z = triangles[t, 2, 2] - az
+            longest = max(np.sqrt(e1x * e1x + e1y * e1y + e1z * e1z),
+                          np.sqrt(e2x * e2x + e2y * e2y + e2z * e2z),
+                          np.sqrt((e2x - e1x) ** 2 + (e2y - e1y) ** 2 + (e2z - e1z) ** 2))
+            n = max(1, int(np.ceil(longest / step)))
+            for i in range(n + 1):
+                u = i / n
+                for j in range(n + 1 - i):
+                    w = j / n
+                    ix = int(np.floor((ax + u * e1x + w * e2x - origin[0]) / pitch + 0.5))
+                    iy = int(np.floor((ay + u * e1y + w * e2y - origin[1]) / pitch + 0.5))
+                    iz = int(np.floor((az + u * e1z + w * e2z - origin[2]) / pitch + 0.5))
+                    if 0 <= ix < nx and 0 <= iy < ny and 0 <= iz < nz:
+                        volume[ix, iy, iz] = 1
+    
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _sample_mpr(data, curve, normals, width_range, out):
+        """Trilinear sampling of the volume along curve + normal * offset"""
+        nx, ny, nz = data.shape
+        flat = data.ravel()
+        # خطوات الـ volume (C-contiguous) محسوبة مرة واحدة
+        step_y = nz
+        step_x = ny * nz
+        for i in prange(curve.shape[0]):
+            cx, cy, cz = curve[i, 0], curve[i, 1], curve[i, 2]
+            dx, dy, dz = normals[i, 0], normals[i, 1], normals[i, 2]
+            for j in range(width_range.shape[0]):
+                sx = cx + dx * width_range[j]
+                sy = cy + dy * width_range[j]
+                sz = cz + dz * width_range[j]
+                if (sx < 0.0 or sy < 0.0 or sz < 0.0 or
+                        sx > nx - 1 or sy > ny - 1 or sz > nz - 1):
+                    out[j, i] = 0.0
+                    continue
+                x0 = min(int(sx), nx - 2)
+                y0 = min(int(sy), ny - 2)
+                z0 = min(int(sz), nz - 2)
+                fx = sx - x0
+                fy = sy - y0
+                fz = sz - z0
+                base = x0 * step_x + y0 * step_y + z0
+                c00 = flat[base] + fx * (flat[base + step_x] - flat[base])
+                c10 = flat[base + step_y] + fx * (flat[base + step_x + step_y] - flat[base + step_y])
+                c01 = flat[base + 1] + fx * (flat[base + step_x + 1] - flat[base + 1])
+                c11 = (flat[base + step_y + 1] +
+                       fx * (flat[base + step_x + step_y + 1] - flat[base + step_y + 1]))
+                c0 = c00 + fy * (c10 - c00)
+                c1 = c01 + fy * (c11 - c01)
+                out[j, i] = c0 + fz * (c1 - c0)
+
+
+def downsample_volume(data, factor):
+    """
+    تصغير الـ volume: متوسط بلوكات للمعامل الصحيح، وإلا zoom خطي
+    """
+    data = np.asarray(data, dtype=np.float32)
+    s = int(factor)
+    if s >= 1 and s == factor:
+        # نجمع الشرائح المتباعدة بخطوة s على كل محور ثم نقسم على s^3
+        d = data[:data.shape[0] // s * s, :data.shape[1] // s * s, :data.shape[2] // s * s]
+        for axis in range(3):
+            d = sum(d[(slice(None),) * axis + (slice(k, None, s),)] for k in range(s))
+        return d / np.float32(s ** 3)
+    return zoom(data, 1 / factor, order=1, prefilter=False, mode='nearest')
+
+
+# مواضع نقاط التحكم الخمس: (نسبة على طول الاتجاه، نسبة الانحناء العمودي)
+CURVE_OFFSETS = np.array([[0.0, 0.0],
+                          [0.25, 0.5],
+                          [0.5, 1.0],
+                          [0.75, 0.5],
+                          [1.0, 0.0]])
+
+
 class InteractiveCurvedMPR:
     def __init__(self, data, downsample_factor=2):
         self.original_data = data
@@ -121,7 +238,7 @@ class InteractiveCurvedMPR:
         # تصغير البيانات
         if downsample_factor > 1:
             print(f"⬇ Downsampling by {downsample_factor}x...")
-            self.data = zoom(data, 1/downsample_factor, order=1)
+            self.data = downsample_volume(data, downsample_factor)
         else:
             self.data = data.copy()
         
@@ -131,12 +248,34 @@ class InteractiveCurvedMPR:
         
         print(f"✓ Working data shape: {self.data.shape}")
         
+        # float32 كافي للبيانات المطبّعة ويقلل الذاكرة للنصف
+        self.data = self.data.astype(np.float32, copy=False)
+        # البيانات مطبّعة [0, 1]: Normalize واحد مشترك لكل الصور
+        self._norm = Normalize(vmin=0, vmax=1)
+        
+        # نسخة من الـ volume على الـ GPU لو CuPy متاح
+        self._d_data = None
+        if HAS_CUPY:
+            try:
+                self._d_data = cp.asarray(self.data)
+            except Exception as e:
+                print(f"⚠ GPU not available, using CPU: {e}")
+        
         # الإعدادات
         self.current_slice_ax = self.data.shape[2] // 2
         self.current_slice_cor = self.data.shape[1] // 2
         self.current_slice_sag = self.data.shape[0] // 2
         
-        self.points = []
+        # نقاط المسار بتخزين SoA: مصفوفة لكل محور + عدد النقاط
+        self._px = np.empty(16, dtype=np.float32)
+        self._py = np.empty(16, dtype=np.float32)
+        self._pz = np.empty(16, dtype=np.float32)
+        self._n_points = 0
+        self._points_version = 0  # يزيد مع كل تعديل على النقاط
+        self._curve_key = None  # (انحناء، نسخة النقاط) لآخر منحنى محسوب
+        self._curve_cache = None
+        self._curve_hr_key = None
+        self._curve_hr_cache = None
         self.curve_factor = 0.4
         self.active_view = 'sagittal'
         self.mpr_height = 140
@@ -161,8 +300,8 @@ class InteractiveCurvedMPR:
                                pad=10,
                                bbox=dict(boxstyle='round,pad=0.6', facecolor='#2196F3', 
                                        edgecolor='#64B5F6', linewidth=2, alpha=0.95))
-        self.img_axial = self.ax_axial.imshow(self.data[:, :, self.current_slice_ax].T, 
-                                              cmap=spinal_cmap, origin='lower', picker=True, vmin=0, vmax=1)
+        self.img_axial = self.ax_axial.imshow(self._slice_image(2, self.current_slice_ax), 
+                                              cmap=spinal_cmap, origin='lower', picker=True, norm=self._norm)
         self.ax_axial.axis('off')
         
         # Coronal view
@@ -172,8 +311,8 @@ class InteractiveCurvedMPR:
                                  pad=10,
                                  bbox=dict(boxstyle='round,pad=0.6', facecolor='#4CAF50',
                                          edgecolor='#81C784', linewidth=2, alpha=0.95))
-        self.img_coronal = self.ax_coronal.imshow(self.data[:, self.current_slice_cor, :].T, 
-                                                  cmap=spinal_cmap, origin='lower', picker=True, vmin=0, vmax=1)
+        self.img_coronal = self.ax_coronal.imshow(self._slice_image(1, self.current_slice_cor), 
+                                                  cmap=spinal_cmap, origin='lower', picker=True, norm=self._norm)
         self.ax_coronal.axis('off')
         
         # Sagittal view
@@ -183,8 +322,8 @@ class InteractiveCurvedMPR:
                                   pad=10,
                                   bbox=dict(boxstyle='round,pad=0.6', facecolor='#F44336',
                                           edgecolor='#E57373', linewidth=2, alpha=0.95))
-        self.img_sagittal = self.ax_sagittal.imshow(self.data[self.current_slice_sag, :, :].T, 
-                                                    cmap=spinal_cmap, origin='lower', picker=True, vmin=0, vmax=1)
+        self.img_sagittal = self.ax_sagittal.imshow(self._slice_image(0, self.current_slice_sag), 
+                                                    cmap=spinal_cmap, origin='lower', picker=True, norm=self._norm)
         self.ax_sagittal.axis('off')
         
         # معلومات
@@ -268,6 +407,8 @@ class InteractiveCurvedMPR:
         self.slider_curve.on_changed(self.update_curve_factor)
         
         self.fig.canvas.mpl_connect('button_press_event', self.on_click)
+        self.fig.canvas.mpl_connect('resize_event', self._on_resize)
+        self._mpr_im = None
         
         # رسم المؤشرات
         self.line_axial, = self.ax_axial.plot([], [], '-', color='#FF1744', linewidth=3, alpha=0.9)
@@ -289,12 +430,45 @@ class InteractiveCurvedMPR:
                                                alpha=0.95, edgecolor='#00BCD4', linewidth=2.5))
         
         plt.tight_layout()
+        
+        # blitting: الخطوط والنقاط ونص المعلومات تُرسم فوق خلفية محفوظة
+        self._blit_views = [(self.ax_axial, self.line_axial, self.points_axial),
+                            (self.ax_coronal, self.line_coronal, self.points_coronal),
+                            (self.ax_sagittal, self.line_sagittal, self.points_sagittal)]
+        self._backgrounds = None
+        if getattr(self.fig.canvas, 'supports_blit', False):
+            for _, line, pts in self._blit_views:
+                line.set_animated(True)
+                pts.set_animated(True)
+            self.info_text.set_animated(True)
+            self.fig.canvas.mpl_connect('draw_event', self._on_draw)
+    
+    def _slice_image(self, axis, index):
+        """شريحة 2D متصلة في الذاكرة بالاتجاه اللي يعرضه imshow"""
+        return np.ascontiguousarray(np.take(self.data, index, axis=axis).T)
     
     def get_info_text(self):
-        return (f"● Selected Points: {len(self.points)} | "
+        return (f"● Selected Points: {self._n_points} | "
                 f"Curvature: {self.curve_factor:.2f} | "
                 f"Resolution: {self.mpr_points}×{self.mpr_height} ●")
     
+    @property
+    def points(self):
+        """النقاط المختارة كمصفوفة (n, 3) - تُبنى فقط عند الحاجة"""
+        n = self._n_points
+        return np.stack([self._px[:n], self._py[:n], self._pz[:n]], axis=1)
+    
+    def _add_point(self, point):
+        """إضافة نقطة مع مضاعفة السعة عند الامتلاء"""
+        if self._n_points == len(self._px):
+            self._px = np.concatenate([self._px, np.empty_like(self._px)])
+            self._py = np.concatenate([self._py, np.empty_like(self._py)])
+            self._pz = np.concatenate([self._pz, np.empty_like(self._pz)])
+        n = self._n_points
+        self._px[n], self._py[n], self._pz[n] = point
+        self._n_points += 1
+        self._points_version += 1
+    
     def on_click(self, event):
         if event.inaxes in [self.ax_axial, self.ax_coronal, self.ax_sagittal]:
             if event.button == 1:
@@ -307,12 +481,12 @@ class InteractiveCurvedMPR:
                 elif event.inaxes == self.ax_sagittal:
                     point = [self.current_slice_sag, x, y]
                 
-                self.points.append(point)
-                print(f"Added point {len(self.points)}: {point}")
+                self._add_point(point)
+                print(f"Added point {self._n_points}: {point}")
                 self.update_display()
     
     def update_display(self):
-        if len(self.points) == 0:
+        if self._n_points == 0:
             self.line_axial.set_data([], [])
             self.points_axial.set_data([], [])
             self.line_coronal.set_data([], [])
@@ -320,108 +494,125 @@ class InteractiveCurvedMPR:
             self.line_sagittal.set_data([], [])
             self.points_sagittal.set_data([], [])
         else:
-            points_arr = np.array(self.points)
+            n = self._n_points
+            px, py, pz = self._px[:n], self._py[:n], self._pz[:n]
             
-            self.points_axial.set_data(points_arr[:, 0], points_arr[:, 1])
-            if len(self.points) >= 2:
+            self.points_axial.set_data(px, py)
+            if self._n_points >= 2:
                 curve = self.create_curve()
                 self.line_axial.set_data(curve[:, 0], curve[:, 1])
             else:
                 self.line_axial.set_data([], [])
             
-            self.points_coronal.set_data(points_arr[:, 0], points_arr[:, 2])
-            if len(self.points) >= 2:
+            self.points_coronal.set_data(px, pz)
+            if self._n_points >= 2:
                 self.line_coronal.set_data(curve[:, 0], curve[:, 2])
             else:
                 self.line_coronal.set_data([], [])
             
-            self.points_sagittal.set_data(points_arr[:, 1], points_arr[:, 2])
-            if len(self.points) >= 2:
+            self.points_sagittal.set_data(py, pz)
+            if self._n_points >= 2:
                 self.line_sagittal.set_data(curve[:, 1], curve[:, 2])
             else:
                 self.line_sagittal.set_data([], [])
         
         self.info_text.set_text(self.get_info_text())
-        self.fig.canvas.draw_idle()
+        if self._backgrounds is None:
+            self.fig.canvas.draw_idle()
+        else:
+            self._blit_overlays()
+    
+    def _on_draw(self, event):
+        """حفظ خلفيات الـ views بعد كل رسم كامل"""
+        canvas = self.fig.canvas
+        self._backgrounds = [canvas.copy_from_bbox(ax.bbox) for ax, _, _ in self._blit_views]
+        # شريط أعلى الشكل فوق الـ views (مكان نص المعلومات)
+        top = max(ax.bbox.y1 for ax, _, _ in self._blit_views)
+        self._info_region = Bbox.from_extents(self.fig.bbox.x0, top,
+                                              self.fig.bbox.x1, self.fig.bbox.y1)
+        self._info_background = canvas.copy_from_bbox(self._info_region)
+        self._blit_overlays()
+    
+    def _blit_overlays(self):
+        """إعادة رسم الخطوط والنقاط ونص المعلومات فقط"""
+        canvas = self.fig.canvas
+        for (ax, line, pts), background in zip(self._blit_views, self._backgrounds):
+            canvas.restore_region(background)
+            ax.draw_artist(line)
+            ax.draw_artist(pts)
+            canvas.blit(ax.bbox)
+        canvas.restore_region(self._info_background)
+        self.fig.draw_artist(self.info_text)
+        canvas.blit(self._info_region)
+    
+    def _fit_spline(self, control_points, n_samples):
+        """Spline تمر بنقاط التحكم، أو None لو النقاط مكررة"""
+        k = 3 if len(control_points) >= 4 else len(control_points) - 1
+        try:
+            tck, u = splprep([control_points[:, 0], control_points[:, 1], control_points[:, 2]], 
+                            s=0, k=k)
+        except (ValueError, TypeError):
+            return None
+        return np.array(splev(np.linspace(0, 1, n_samples), tck)).T
+    
+    def _build_controls(self, points_arr):
+        """نقاط التحكم: 5 نقاط منحنية بين نقطتين، أو النقاط نفسها"""
+        if len(points_arr) != 2:
+            return points_arr
+        
+        start, end = points_arr[0], points_arr[1]
+        direction = end - start
+        
+        if abs(direction[0]) > abs(direction[2]):
+            perpendicular = np.array([-direction[1], direction[0], 0])
+        else:
+            perpendicular = np.array([0, -direction[2], direction[1]])
+        
+        bend = perpendicular * (np.linalg.norm(direction) * self.curve_factor /
+                                (np.linalg.norm(perpendicular) + 1e-10))
+        return start + CURVE_OFFSETS[:, 0:1] * direction + CURVE_OFFSETS[:, 1:2] * bend
     
     def create_curve(self):
-        if len(self.points) < 2:
+        if self._n_points < 2:
             return np.array([])
         
-        points_arr = np.array(self.points, dtype=float)
+        key = (self.curve_factor, self._points_version)
+        if key == self._curve_key:
+            return self._curve_cache
         
-        if len(self.points) == 2:
-            start, end = points_arr[0], points_arr[1]
-            mid = (start + end) / 2
-            direction = end - start
-            
-            if abs(direction[0]) > abs(direction[2]):
-                perpendicular = np.array([-direction[1], direction[0], 0])
-            else:
-                perpendicular = np.array([0, -direction[2], direction[1]])
-            
-            perpendicular = perpendicular / (np.linalg.norm(perpendicular) + 1e-10)
-            
-            control_points = np.array([
-                start,
-                start + direction * 0.25 + perpendicular * np.linalg.norm(direction) * self.curve_factor * 0.5,
-                mid + perpendicular * np.linalg.norm(direction) * self.curve_factor,
-                end - direction * 0.25 + perpendicular * np.linalg.norm(direction) * self.curve_factor * 0.5,
-                end
-            ])
-        else:
-            control_points = points_arr
+        points_arr = self.points.astype(float)
         
-        try:
-            tck, u = splprep([control_points[:, 0], control_points[:, 1], control_points[:, 2]], 
-                            s=0, k=min(3, len(control_points)-1))
-            u_new = np.linspace(0, 1, 100)
-            curve = np.array(splev(u_new, tck)).T
-            return curve
-        except:
+        control_points = self._build_controls(points_arr)
+        
+        curve = self._fit_spline(control_points, 100)
+        if curve is None:
             return points_arr
+        self._curve_key, self._curve_cache = key, curve
+        return curve
     
     def create_curve_high_res(self):
-        if len(self.points) < 2:
+        if self._n_points < 2:
             return np.array([])
         
-        points_arr = np.array(self.points, dtype=float)
+        key = (self.mpr_points, self.curve_factor, self._points_version)
+        if key == self._curve_hr_key:
+            return self._curve_hr_cache
         
-        if len(self.points) == 2:
-            start, end = points_arr[0], points_arr[1]
-            mid = (start + end) / 2
-            direction = end - start
-            
-            if abs(direction[0]) > abs(direction[2]):
-                perpendicular = np.array([-direction[1], direction[0], 0])
-            else:
-                perpendicular = np.array([0, -direction[2], direction[1]])
-            
-            perpendicular = perpendicular / (np.linalg.norm(perpendicular) + 1e-10)
-            
-            control_points = np.array([
-                start,
-                start + direction * 0.25 + perpendicular * np.linalg.norm(direction) * self.curve_factor * 0.5,
-                mid + perpendicular * np.linalg.norm(direction) * self.curve_factor,
-                end - direction * 0.25 + perpendicular * np.linalg.norm(direction) * self.curve_factor * 0.5,
-                end
-            ])
-        else:
-            control_points = points_arr
+        points_arr = self.points.astype(float)
         
-        try:
-            tck, u = splprep([control_points[:, 0], control_points[:, 1], control_points[:, 2]], 
-                            s=0, k=min(3, len(control_points)-1))
-            u_new = np.linspace(0, 1, self.mpr_points)
-            curve = np.array(splev(u_new, tck)).T
-            return curve
-        except:
+        control_points = self._build_controls(points_arr)
+        
+        curve = self._fit_spline(control_points, self.mpr_points)
+        if curve is None:
             return points_arr
+        self._curve_hr_key, self._curve_hr_cache = key, curve
+        return curve
     
     def generate_mpr(self, event):
-        if len(self.points) < 2:
+        if self._n_points < 2:
             print("⚠ Need at least 2 points!")
             self.ax_mpr.clear()
+            self._mpr_im = None
             self.ax_mpr.text(0.5, 0.5, '⚠ Add at least 2 points!', 
                            ha='center', va='center', fontsize=16, color='red', fontweight='bold')
             self.ax_mpr.axis('off')
@@ -436,7 +627,7 @@ class InteractiveCurvedMPR:
         mpr_image = self.extract_mpr(curve)
         
         if mpr_image.max() > 0:
-            p1, p99 = np.percentile(mpr_image[mpr_image > 0], (1, 99))
+            p1, p99 = np.percentile(self._nonzero_sample(mpr_image), (1, 99))
             mpr_enhanced = np.clip((mpr_image - p1) / (p99 - p1 + 1e-10), 0, 1)
             mpr_enhanced = np.power(mpr_enhanced, 0.8)
         else:
@@ -447,10 +638,15 @@ class InteractiveCurvedMPR:
         
         aspect_ratio = mpr_enhanced.shape[0] / mpr_enhanced.shape[1]
         
-        im = self.ax_mpr.imshow(mpr_enhanced, cmap='gray', 
-                                aspect=aspect_ratio * 2.2,
-                                interpolation='lanczos',
-                                vmin=0, vmax=1)
+        self._mpr_source = mpr_enhanced
+        self._mpr_aspect = aspect_ratio * 2.2
+        im = self.ax_mpr.imshow(self._resample_mpr(), cmap='gray', 
+                                aspect=self._mpr_aspect,
+                                interpolation='nearest',
+                                extent=(-0.5, mpr_enhanced.shape[1] - 0.5,
+                                        mpr_enhanced.shape[0] - 0.5, -0.5),
+                                norm=self._norm)
+        self._mpr_im = im
         
         from mpl_toolkits.axes_grid1 import make_axes_locatable
         divider = make_axes_locatable(self.ax_mpr)
@@ -499,76 +695,89 @@ class InteractiveCurvedMPR:
         print(f"  Resolution: {mpr_enhanced.shape}")
         print("="*50)
     
+    def _resample_mpr(self):
+        """تكبير الـ MPR مرة واحدة لحجم العرض (cubic) بدل lanczos في كل رسم"""
+        image = self._mpr_source
+        h, w = image.shape
+        box = self.ax_mpr.get_window_extent()
+        scale = min(box.width / w, box.height / (self._mpr_aspect * h))
+        factors = (max(1.0, scale * self._mpr_aspect), max(1.0, scale))
+        if factors == (1.0, 1.0):
+            return image
+        return np.clip(zoom(image, factors, order=3), 0, 1)
+    
+    def _on_resize(self, event):
+        if self._mpr_im is not None:
+            self._mpr_im.set_data(self._resample_mpr())
+    
+    @staticmethod
+    def _nonzero_sample(image):
+        """قيم غير صفرية من عينة كل 2 بكسل (كافية لحساب الـ percentiles)"""
+        sample = image[::2, ::2]
+        sample = sample[sample > 0]
+        return sample if sample.size else image[image > 0]
+    
     def extract_mpr(self, curve_path):
         num_points = len(curve_path)
         normals = self.compute_normals(curve_path)
         
         height = self.mpr_height
-        mpr_image = np.zeros((height, num_points))
         width_range = np.linspace(-height/2, height/2, height)
         
-        print("Progress: ", end="", flush=True)
-        step = max(1, num_points // 10)
+        if self._d_data is not None:
+            d_samples = (cp.asarray(curve_path.T)[:, None, :] +
+                         cp.asarray(normals.T)[:, None, :] * cp.asarray(width_range)[None, :, None])
+            values = cupy_ndimage.map_coordinates(self._d_data, d_samples.reshape(3, -1),
+                                                  order=1, mode='constant', cval=0.0)
+            return values.reshape(height, num_points).get()
+        
+        if HAS_NUMBA:
+            mpr_image = np.empty((height, num_points), dtype=np.float32)
+            _sample_mpr(self.data, curve_path, normals, width_range, mpr_image)
+            return mpr_image
+        
+        # كل نقاط العينة مرة واحدة: (3, height, num_points)
+        samples = (curve_path.T[:, None, :] +
+                   normals.T[:, None, :] * width_range[None, :, None])
+        values = map_coordinates(self.data, samples.reshape(3, -1),
+                                 order=1, mode='constant', cval=0.0)
+        mpr_image = values.reshape(height, num_points)
         
-        for i in range(num_points):
-            if i % step == 0:
-                print("█", end="", flush=True)
-            
-            center = curve_path[i]
-            normal = normals[i]
-            
-            for j, offset in enumerate(width_range):
-                sample_point = center + normal * offset
-                
-                if all(0 <= sample_point[k] < self.data.shape[k]-1 for k in range(3)):
-                    coords = sample_point.reshape(3, 1)
-                    value = map_coordinates(self.data, coords, order=1, mode='constant', cval=0.0)
-                    mpr_image[j, i] = value[0]
-        
-        print(" ✓")
         return mpr_image
     
     def compute_normals(self, curve):
-        n_points = len(curve)
-        normals = np.zeros_like(curve)
-        
-        for i in range(n_points):
-            if i == 0:
-                tangent = curve[i+1] - curve[i]
-            elif i == n_points - 1:
-                tangent = curve[i] - curve[i-1]
-            else:
-                tangent = (curve[i+1] - curve[i-1]) / 2
-            
-            tangent = tangent / (np.linalg.norm(tangent) + 1e-10)
-            
-            if abs(tangent[2]) < 0.9:
-                normal = np.cross(tangent, np.array([0, 0, 1]))
-            else:
-                normal = np.cross(tangent, np.array([1, 0, 0]))
-            
-            normals[i] = normal / (np.linalg.norm(normal) + 1e-10)
+        tangents = np.gradient(curve, axis=0)
+        tangents = tangents / (np.linalg.norm(tangents, axis=1, keepdims=True) + 1e-10)
         
-        return normals
+        ref = np.where(np.abs(tangents[:, 2:3]) < 0.9,
+                       np.array([0.0, 0.0, 1.0]), np.array([1.0, 0.0, 0.0]))
+        normals = np.cross(tangents, ref)
+        
+        return normals / (np.linalg.norm(normals, axis=1, keepdims=True) + 1e-10)
     
     def clear_points(self, event):
-        self.points = []
+        self._n_points = 0
+        self._points_version += 1
         self.ax_mpr.clear()
+        self._mpr_im = None
         self.ax_mpr.set_title('🦴 SPINAL CORD MPR - Click points', 
                              fontweight='bold', fontsize=13, color='red')
         self.ax_mpr.axis('off')
         self.update_display()
+        self.fig.canvas.draw_idle()
         print("✓ All cleared")
     
     def undo_last(self, event):
-        if self.points:
-            removed = self.points.pop()
+        if self._n_points:
+            removed = self.points[-1].tolist()
+            self._n_points -= 1
+            self._points_version += 1
             print(f"✓ Removed: {removed}")
             self.update_display()
     
     def update_curve_factor(self, val):
         self.curve_factor = val
-        if len(self.points) >= 2:
+        if self._n_points >= 2:
             self.update_display()
     
     def show(self):
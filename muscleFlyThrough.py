@@ -1,7 +1,9 @@
 import os
-import glob
+import math
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pyvista as pv
+import vtk
 from PyQt5 import QtWidgets, QtCore
 from pyvistaqt import BackgroundPlotter
 import sys
@@ -29,6 +31,9 @@ SURFACE_COLORS = {
     'default':     (0.8, 0.8, 0.8),   # Default gray
 }
 
+# Samples per baked camera path (indexed by animation progress)
+PATH_SAMPLES = 1024
+
 
 def is_surface_part(filename: str) -> bool:
     """Check if file is a surface part - accepts all OBJ files"""
@@ -45,12 +50,65 @@ def classify_region(filename: str) -> str:
     return 'default'
 
 
+def stack_xyz(x, y, z, n):
+    """(n, 3) float32 array from per-axis values that are scalars or length-n arrays"""
+    out = np.empty((n, 3), dtype=np.float32)
+    out[:, 0] = x
+    out[:, 1] = y
+    out[:, 2] = z
+    return out
+
+
+def progress_labels(template, fraction, scale=100):
+    """Label per path sample, formatting each distinct integer value only once"""
+    labels = np.array([template.format(v) for v in range(scale + 1)])
+    return labels[(fraction * scale).astype(int)]
+
+
+def display_normals(mesh):
+    """Plain point normals for smooth shading (no orientation/consistency passes)"""
+    normals = vtk.vtkPolyDataNormals()
+    normals.SetInputData(mesh)
+    normals.ComputePointNormalsOn()
+    normals.ComputeCellNormalsOff()
+    normals.SplittingOff()
+    normals.ConsistencyOff()
+    normals.AutoOrientNormalsOff()
+    normals.NonManifoldTraversalOff()
+    normals.Update()
+    return pv.wrap(normals.GetOutput())
+
+
+def load_surface(path, strict=False):
+    """Read one OBJ, compute display normals and a decimated LOD copy (runs in a worker thread)"""
+    mesh = pv.read(path)
+    if mesh.n_points == 0:
+        return None
+    # The reader gives float64 points; float32 is what the GPU gets anyway
+    mesh.points = mesh.points.astype(np.float32, copy=False)
+    if strict:
+        mesh = mesh.clean()
+    if mesh.point_data.active_normals is None:
+        mesh = display_normals(mesh)
+    lod = display_normals(mesh.triangulate().decimate(0.8))
+    return mesh, lod
+
+
 class SpinalCordFlythrough(QtWidgets.QMainWindow):
-    def __init__(self, files):
+    def __init__(self, files, strict=False):
         super().__init__()
         self.files = files
+        self.strict = strict  # clean() every mesh on load
         self.parts = []
         
+        # All parts are drawn as blocks of one composite actor
+        self.multiblock = pv.MultiBlock()
+        self.lod_multiblock = pv.MultiBlock()  # same layout, ~20% of the triangles
+        self.region_blocks = {}  # region -> flat block indices
+        self.composite_actor = None
+        self.composite_mapper = None
+        self._full_input = None
+        
         # Animation state
         self.is_animating = False
         self.animation_progress = 0.0
@@ -60,6 +118,10 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
         self.center_point = None
         self.spinal_bounds = None
         self.current_path_mode = 3  # Default to Close Inner (index 3)
+        self._path_tables = {}  # mode -> baked (cam_pos, focal, up, names)
+        self._last_cam_pos = None  # camera position at the last path render
+        self._render_threshold = 0.0
+        self._vtk_camera = None
         
         # Timer
         self.timer = QtCore.QTimer()
@@ -218,21 +280,29 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
     
     def _load_meshes(self):
         loaded = 0
-        for path in self.files:
+        # Reading and filtering run in threads; the scene is built here
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            futures = [pool.submit(load_surface, path, self.strict) for path in self.files]
+        
+        for path, future in zip(self.files, futures):
             try:
-                mesh = pv.read(path)
-                if mesh.n_points == 0:
+                result = future.result()
+                if result is None:
                     continue
-                mesh = mesh.clean()
-                mesh = mesh.compute_normals(auto_orient_normals=True)
+                mesh, lod = result
                 name = os.path.basename(path)
                 region = classify_region(name)
                 color = SURFACE_COLORS.get(region, SURFACE_COLORS['default'])
+                self.multiblock.append(mesh, name)
+                self.lod_multiblock.append(lod, name)
+                block = self.multiblock.n_blocks  # flat index, 0 is the root
+                self.region_blocks.setdefault(region, []).append(block)
                 self.parts.append({
                     'name': name,
+                    'region': region,
                     'mesh': mesh,
                     'color': color,
-                    'actor': None
+                    'block': block
                 })
                 loaded += 1
                 print(f"✅ Loaded: {name}")
@@ -245,15 +315,19 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
             print("❌ No parts loaded!")
             return
         
+        # Normals come from load_surface; smooth_shading would recompute them on
+        # a split copy, so phong interpolation renders the loader's normals instead
+        self.composite_actor, self.composite_mapper = self.plotter.add_composite(
+            self.multiblock,
+            opacity=0.5,
+            smooth_shading=False,
+            interpolation='phong',
+            lighting=True,
+            render=False
+        )
+        self._full_input = self.composite_mapper.GetInputDataObject(0, 0)
         for part in self.parts:
-            actor = self.plotter.add_mesh(
-                part['mesh'],
-                color=part['color'],
-                opacity=0.5,
-                smooth_shading=True,
-                lighting=True
-            )
-            part['actor'] = actor
+            self.composite_mapper.block_attr[part['block']].color = part['color']
         
         self.plotter.remove_all_lights()
         
@@ -284,6 +358,12 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
             (bounds[4] + bounds[5]) / 2
         ])
         
+        self._path_tables.clear()
+        # Skip re-rendering for camera moves under 0.1% of the scene diagonal
+        diagonal = np.linalg.norm([bounds[1] - bounds[0], bounds[3] - bounds[2], bounds[5] - bounds[4]])
+        self._render_threshold = 0.001 * diagonal
+        self._last_cam_pos = None
+        
         print(f"\nSpinal Cord Center: {self.center_point}")
         print(f"Spinal Cord Bounds: {bounds}")
         
@@ -296,20 +376,32 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
         self.plotter.camera.focal_point = (self.center_point[0], self.center_point[1], initial_cam_z - 50)
         self.plotter.camera.up = (0, 1, 0)
         self.plotter.render()
+        self._vtk_camera = self.plotter.renderer.GetActiveCamera()
         
         print("✅ Scene ready - Starting at EXACT CENTER inside spinal canal")
     
-    def _get_camera_path_position(self, progress):
-        mode = self.path_combo.currentIndex()
+    def _path_table(self, mode):
+        """Baked (cam_pos, focal, up, names) samples for a path mode"""
+        table = self._path_tables.get(mode)
+        if table is None:
+            table = self._bake_path(mode)
+            self._path_tables[mode] = table
+        return table
+    
+    def _bake_path(self, mode):
+        t = np.arange(PATH_SAMPLES) / PATH_SAMPLES
         if mode == 0:
-            return self._vertical_journey_path(progress)
+            path = self._vertical_journey_path(t)
         elif mode == 1:
-            return self._spiral_around_path(progress)
+            path = self._spiral_around_path(t)
         elif mode == 2:
-            return self._circular_orbit_path(progress)
-        elif mode == 3:
-            return self._close_inner_path(progress)
-        return self._close_inner_path(progress)
+            path = self._circular_orbit_path(t)
+        else:
+            path = self._close_inner_path(t)
+        cam_pos, focal, up, names = path
+        n = len(t)
+        return (stack_xyz(*cam_pos, n), stack_xyz(*focal, n),
+                stack_xyz(*up, n), names)
     
     def _vertical_journey_path(self, t):
         """Fixed vertical path: Top → Bottom → Top (Outside view)"""
@@ -322,23 +414,21 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
         y_range = self.spinal_bounds[3] - self.spinal_bounds[2]
         offset_distance = max(x_range, y_range) * 0.8
         
-        if t < 0.5:
-            phase_t = t / 0.5
-            cam_z = z_max - (z_range * phase_t)
-            position_name = f"⬇️ Descending ({int(phase_t*100)}%)"
-        else:
-            phase_t = (t - 0.5) / 0.5
-            cam_z = z_min + (z_range * phase_t)
-            position_name = f"⬆️ Ascending ({int(phase_t*100)}%)"
+        descending = t < 0.5
+        phase_t = np.where(descending, t / 0.5, (t - 0.5) / 0.5)
+        cam_z = np.where(descending, z_max - (z_range * phase_t), z_min + (z_range * phase_t))
+        position_names = np.where(descending,
+                                  progress_labels("⬇️ Descending ({}%)", phase_t),
+                                  progress_labels("⬆️ Ascending ({}%)", phase_t))
         
         cam_x = cx + offset_distance
         cam_y = cy
         
-        cam_pos = np.array([cam_x, cam_y, cam_z])
-        focal = np.array([cx, cy, cam_z])
-        up = np.array([0, 1, 0])
+        cam_pos = (cam_x, cam_y, cam_z)
+        focal = (cx, cy, cam_z)
+        up = (0, 1, 0)
         
-        return cam_pos, focal, up, position_name
+        return cam_pos, focal, up, position_names
     
     def _spiral_around_path(self, t):
         """Spiral around the spine while moving vertically"""
@@ -357,12 +447,12 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
         cam_x = cx + radius * np.cos(angle)
         cam_y = cy + radius * np.sin(angle)
         
-        cam_pos = np.array([cam_x, cam_y, cam_z])
-        focal = np.array([cx, cy, cam_z])
-        up = np.array([0, 0, 1])
+        cam_pos = (cam_x, cam_y, cam_z)
+        focal = (cx, cy, cam_z)
+        up = (0, 0, 1)
         
-        position_name = f"🌀 Spiraling ({int(t*100)}%)"
-        return cam_pos, focal, up, position_name
+        position_names = progress_labels("🌀 Spiraling ({}%)", t)
+        return cam_pos, focal, up, position_names
     
     def _circular_orbit_path(self, t):
         """Circle around the spine at mid-height"""
@@ -378,12 +468,12 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
         cam_y = cy + radius * np.sin(angle)
         cam_z = cz
         
-        cam_pos = np.array([cam_x, cam_y, cam_z])
-        focal = self.center_point
-        up = np.array([0, 0, 1])
+        cam_pos = (cam_x, cam_y, cam_z)
+        focal = (cx, cy, cz)
+        up = (0, 0, 1)
         
-        position_name = f"🔄 Orbiting ({int(t*360)}°)"
-        return cam_pos, focal, up, position_name
+        position_names = progress_labels("🔄 Orbiting ({}°)", t, scale=360)
+        return cam_pos, focal, up, position_names
     
     def _close_inner_path(self, t):
         """
@@ -397,18 +487,15 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
         z_range = z_max - z_min
         
         # Move vertically from top to bottom and back
-        if t < 0.5:
-            # First half: Top to Bottom
-            phase_t = t / 0.5
-            cam_z = z_max - (z_range * phase_t)
-            focal_z = cam_z - z_range * 0.15  # Look ahead downward
-            position_name = f"🎯 Inside Canal - Descending ({int(phase_t*100)}%)"
-        else:
-            # Second half: Bottom to Top
-            phase_t = (t - 0.5) / 0.5
-            cam_z = z_min + (z_range * phase_t)
-            focal_z = cam_z + z_range * 0.15  # Look ahead upward
-            position_name = f"🎯 Inside Canal - Ascending ({int(phase_t*100)}%)"
+        # First half: Top to Bottom, looking ahead downward
+        # Second half: Bottom to Top, looking ahead upward
+        descending = t < 0.5
+        phase_t = np.where(descending, t / 0.5, (t - 0.5) / 0.5)
+        cam_z = np.where(descending, z_max - (z_range * phase_t), z_min + (z_range * phase_t))
+        focal_z = np.where(descending, cam_z - z_range * 0.15, cam_z + z_range * 0.15)
+        position_names = np.where(descending,
+                                  progress_labels("🎯 Inside Canal - Descending ({}%)", phase_t),
+                                  progress_labels("🎯 Inside Canal - Ascending ({}%)", phase_t))
         
         # Camera at EXACT CENTER of the spinal cord
         cam_x = cx
@@ -418,28 +505,46 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
         focal_x = cx
         focal_y = cy
         
-        cam_pos = np.array([cam_x, cam_y, cam_z])
-        focal = np.array([focal_x, focal_y, focal_z])
-        up = np.array([0, 1, 0])
+        cam_pos = (cam_x, cam_y, cam_z)
+        focal = (focal_x, focal_y, focal_z)
+        up = (0, 1, 0)
         
-        return cam_pos, focal, up, position_name
+        return cam_pos, focal, up, position_names
     
     def _set_camera_position_by_path(self, progress):
-        cam_pos, focal, up, pos_name = self._get_camera_path_position(progress)
-        self.plotter.camera.position = tuple(cam_pos)
-        self.plotter.camera.focal_point = tuple(focal)
-        self.plotter.camera.up = tuple(up)
-        self.plotter.render()
-        self.position_label.setText(f"Position: {pos_name}")
+        cam_pos, focal, up, names = self._path_table(self.path_combo.currentIndex())
+        i = int(progress * PATH_SAMPLES) % PATH_SAMPLES
+        if self._last_cam_pos is None or \
+                math.dist(cam_pos[i], self._last_cam_pos) > self._render_threshold:
+            # Straight to the vtkCamera: no tuples, no pyvista property wrappers
+            camera = self._vtk_camera
+            camera.SetPosition(cam_pos[i])
+            camera.SetFocalPoint(focal[i])
+            camera.SetViewUp(up[i])
+            self.plotter.renderer.ResetCameraClippingRange()
+            self.plotter.render()
+            self._last_cam_pos = cam_pos[i]
+        self.position_label.setText(f"Position: {names[i]}")
+    
+    def _use_lod(self, enabled):
+        """Swap the composite input between the full meshes and the decimated LOD"""
+        if self.composite_mapper is None:
+            return
+        self.composite_mapper.SetInputDataObject(
+            self.lod_multiblock if enabled else self._full_input)
     
     def _toggle_animation(self):
         if self.is_animating:
             self.is_animating = False
             self.timer.stop()
+            self._use_lod(False)
+            self.plotter.render()
             self.btn_play.setText("▶ PLAY")
             self.status_label.setText("⏸ Paused")
         else:
             self.is_animating = True
+            self._last_cam_pos = None
+            self._use_lod(True)
             self.timer.start()
             self.btn_play.setText("⏸ PAUSE")
             self.status_label.setText("▶ Flying...")
@@ -453,26 +558,49 @@ class SpinalCordFlythrough(QtWidgets.QMainWindow):
         self._set_camera_position_by_path(self.animation_progress)
         self.progress_label.setText(f"Progress: {int(self.animation_progress * 100)}%")
     
+    def _sync_timer_with_window(self):
+        """Run the animation timer only while the window can actually be seen"""
+        if not self.is_animating:
+            return
+        if self.isMinimized() or not self.isVisible():
+            self.timer.stop()
+        elif not self.timer.isActive():
+            self.timer.start()
+    
+    def changeEvent(self, event):
+        if event.type() == QtCore.QEvent.WindowStateChange:
+            self._sync_timer_with_window()
+        super().changeEvent(event)
+    
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._sync_timer_with_window()
+    
     def _update_speed(self, value):
         self.animation_speed = value * 0.001
         self.speed_value.setText(f"Speed: {value}")
     
     def _update_opacity(self, value):
         opacity = value / 100.0
-        for part in self.parts:
-            if part['actor']:
-                part['actor'].GetProperty().SetOpacity(opacity)
+        if self.composite_actor is not None:
+            self.composite_actor.prop.opacity = opacity
         self.opacity_value.setText(f"Opacity: {value}%")
         self.plotter.render()
     
     def _change_path_mode(self, index):
         self.animation_progress = 0.0
         self.current_path_mode = index
+        self._last_cam_pos = None
         self._set_camera_position_by_path(0.0)
         self.status_label.setText(f"✅ Path changed!")
     
     def _reset_view(self):
         self.animation_progress = 0.0
+        self._last_cam_pos = None
         
         # Reset to EXACT CENTER at the top
         initial_cam_x = self.center_point[0]
@@ -507,9 +635,9 @@ def main():
         print("Please make sure 'spinalcorddataset' folder exists in the current directory\n")
         return
     
-    files = glob.glob(os.path.join(path, "*.obj"))
-    files.extend(glob.glob(os.path.join(path, "*.OBJ")))
-    files = sorted(list(set(files)))
+    # One directory pass; a case-insensitive suffix test covers .obj/.OBJ
+    files = sorted(e.path for e in os.scandir(path)
+                   if e.is_file() and e.name.lower().endswith('.obj'))
     
     if not files:
         print(f"\n❌ No OBJ files found in {path}\n")
@@ -522,7 +650,7 @@ def main():
     app = QtWidgets.QApplication(sys.argv)
     app.setStyle('Fusion')
     
-    window = SpinalCordFlythrough(files)
+    window = SpinalCordFlythrough(files, strict='--strict' in sys.argv[1:])
     window.show()
     
     sys.exit(app.exec_())
@@ -10,24 +10,59 @@ import numpy as np
 import pyvista as pv
 import vtk
 import os
-import glob
-
-# Force on-screen rendering
-os.environ['PYVISTA_OFF_SCREEN'] = '0'
-pv.OFF_SCREEN = False
-pv.global_theme.multi_samples = 4
-
-print("="*70)
-print("HIGH QUALITY SPINE, SPINAL CORD & MUSCLES VISUALIZATION")
-print("="*70)
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 # Define folder paths
 MUSCLES_PATH = r"E:\Task 3\muscelsdataset"
 VERTEBRAE_PATH = r"E:\Task 3\spinalcorddataset"
 SPINAL_CORD_PATH = r"C:\Users\hp\Downloads\project_3\bones\bones"
 
-# Load OBJ files from folders
-components = []
+# Echo key-press feedback to the console as well as the on-screen status line
+VERBOSE = False
+
+# Opacity of the non-focused parts for each transparency level
+OPACITY_LEVELS = {
+    1: 0.5,   # Light transparency
+    2: 0.25,  # Medium transparency
+    3: 0.1,   # High transparency
+    4: 0.0    # Hidden
+}
+LEVEL_NAMES = {1: "Light", 2: "Medium", 3: "High", 4: "Hidden"}
+FOCUS_COLOR = (1.0, 0.85, 0.2)  # Bright yellow
+
+def display_normals(mesh):
+    """Plain point normals for smooth shading (no orientation/consistency passes)"""
+    normals = vtk.vtkPolyDataNormals()
+    normals.SetInputData(mesh)
+    normals.ComputePointNormalsOn()
+    normals.ComputeCellNormalsOff()
+    normals.SplittingOff()
+    normals.ConsistencyOff()
+    normals.AutoOrientNormalsOff()
+    normals.NonManifoldTraversalOff()
+    normals.Update()
+    return pv.wrap(normals.GetOutput())
+
+def make_prop(color):
+    """Phong surface property shared by every part drawn in one colour"""
+    prop = pv.Property(color=color, interpolation='phong')  # smooth shading
+    prop.specular = 0.5
+    prop.specular_power = 30
+    prop.ambient = 0.4
+    prop.diffuse = 0.8
+    return prop
+
+def prepare_mesh(obj_file):
+    """Read, clean and smooth one OBJ, with display normals (VTK releases the GIL, so this runs in worker threads)"""
+    mesh = pv.read(obj_file)
+    # The reader gives float64 points; float32 is what the GPU gets anyway
+    mesh.points = mesh.points.astype(np.float32, copy=False)
+    mesh = mesh.clean()
+    # The Laplacian smoother is O(n_iter * n_points); dense meshes don't need it
+    if mesh.n_points < 50000:
+        mesh = mesh.smooth(n_iter=15, relaxation_factor=0.1)
+    return display_normals(mesh)
 
 def load_obj_files(folder_path, category):
     """Load all OBJ files from a folder"""
@@ -37,7 +72,8 @@ def load_obj_files(folder_path, category):
         print(f"❌ Folder not found: {folder_path}")
         return []
     
-    obj_files = glob.glob(os.path.join(folder_path, "*.obj"))
+    obj_files = sorted(e.path for e in os.scandir(folder_path)
+                       if e.is_file() and e.name.lower().endswith('.obj'))
     
     if len(obj_files) == 0:
         print(f"⚠ No .obj files found in {folder_path}")
@@ -46,17 +82,17 @@ def load_obj_files(folder_path, category):
     print(f"Found {len(obj_files)} OBJ files")
     
     loaded = []
-    for obj_file in obj_files:
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        futures = [pool.submit(prepare_mesh, obj_file) for obj_file in obj_files]
+    
+    for obj_file, future in zip(obj_files, futures):
         filename = os.path.basename(obj_file)
         try:
-            mesh = pv.read(obj_file)
-            
-            # Clean and smooth the mesh
-            mesh = mesh.clean()
-            mesh = mesh.smooth(n_iter=15, relaxation_factor=0.1)
+            mesh = future.result()
             
-            # Calculate center Z coordinate
-            cz = np.mean(mesh.points[:, 2])
+            # Center Z from the (cached) bounds - enough for ordering vertebrae
+            z_min, z_max = mesh.bounds[4:6]
+            cz = 0.5 * (z_min + z_max)
             
             loaded.append({
                 'mesh': mesh,
@@ -72,481 +108,592 @@ def load_obj_files(folder_path, category):
     
     return loaded
 
-# Load muscles
-muscles = load_obj_files(MUSCLES_PATH, "muscle")
-
-# Load vertebrae (bones)
-vertebrae = load_obj_files(VERTEBRAE_PATH, "vertebra")
-
-# Load spinal cord
-spinal_cord = load_obj_files(SPINAL_CORD_PATH, "spinal_cord")
-
-# Sort vertebrae by Z coordinate and assign numbers
-vertebrae.sort(key=lambda x: x['cz'], reverse=True)
-for idx, vert in enumerate(vertebrae):
-    vert['number'] = idx + 1
-
-# Combine all components
-components = vertebrae + spinal_cord + muscles
-
-print(f"\n✅ Total loaded: {len(components)} objects")
-print(f"   - {len(vertebrae)} vertebrae (numbered 1-{len(vertebrae)})")
-print(f"   - {len(spinal_cord)} spinal cord")
-print(f"   - {len(muscles)} muscles")
-
-if len(components) == 0:
-    print("❌ No objects found!")
-    exit(1)
-
-# Create plotter
-plotter = pv.Plotter(window_size=(1920, 1080))
-plotter.set_background((0.1, 0.12, 0.15))
-
-# Enable quality features
-try:
-    plotter.enable_anti_aliasing()
-    plotter.enable_eye_dome_lighting()
-except:
-    print("⚠ Some rendering features not available")
-
-# Add objects to scene
-actors = []
-vertebra_colors = [
-    (0.92, 0.72, 0.52),
-    (0.88, 0.68, 0.48),
-    (0.84, 0.64, 0.44),
-    (0.90, 0.70, 0.50),
-    (0.86, 0.66, 0.46),
-]
-
-# Lighter red colors for muscles
-muscle_colors = [
-    (1.0, 0.5, 0.5),
-    (1.0, 0.55, 0.55),
-    (0.95, 0.45, 0.45),
-    (1.0, 0.6, 0.6),
-    (0.98, 0.52, 0.52),
-]
-
-spinal_cord_colors = [
-    (0.95, 0.95, 0.95),
-    (0.90, 0.90, 0.92),
-    (0.92, 0.92, 0.94),
-    (0.94, 0.94, 0.96),
-]
-
-print("\nAdding objects to scene...")
-vertebra_idx = 0
-muscle_idx = 0
-spinal_idx = 0
-
-for comp in components:
-    if comp['category'] == 'vertebra':
-        color = vertebra_colors[vertebra_idx % len(vertebra_colors)]
-        vertebra_idx += 1
-    elif comp['category'] == 'spinal_cord':
-        color = spinal_cord_colors[spinal_idx % len(spinal_cord_colors)]
-        spinal_idx += 1
-    else:  # muscle
-        color = muscle_colors[muscle_idx % len(muscle_colors)]
-        muscle_idx += 1
-    
-    actor = plotter.add_mesh(
-        comp['mesh'],
-        color=color,
-        smooth_shading=True,
-        specular=0.5,
-        specular_power=30,
-        ambient=0.4,
-        diffuse=0.8,
-        show_edges=False
-    )
+class FocusController:
+    """Focus and transparency state behind the vertebra navigation keys"""
     
-    actors.append(actor)
-    comp['actor'] = actor
+    def __init__(self, plotter, vertebrae, actors_by_category, assemblies,
+                 shared_props, reset_plan, notify, request_render):
+        self.plotter = plotter
+        self.vertebrae_by_number = {vert['number']: vert for vert in vertebrae}
+        self.max_vertebra_num = max(self.vertebrae_by_number, default=0)
+        self.vertebra_actors = actors_by_category['vertebra']
+        self.assemblies = assemblies
+        self.shared_props = shared_props
+        self.reset_plan = reset_plan
+        self.palette_props = {id(actor): prop for actor, prop in reset_plan}
+        self.notify = notify
+        self.request_render = request_render
+        
+        # Only the focused vertebra is highlighted; it gets its palette
+        # property back as soon as the focus moves on
+        self.focus_prop = make_prop(FOCUS_COLOR)
+        
+        self.current_focus = None
+        self.transparency_level = 2  # Default transparency level (1=light, 2=medium, 3=high, 4=hide)
+        
+        # Split at focus time so the transparency pass never re-checks categories
+        self.focused_actor = None
+        self.other_actors = []
+        self.last_other_opacity = None
+        # Visibility last pushed to the non-focused parts; None means it has
+        # to be written again on the next pass
+        self.others_visible = None
+        # True while every part shows its palette property and is visible,
+        # so pressing R again only has to reset the camera
+        self.scene_is_reset = True
     
-    if comp['category'] == 'vertebra':
-        print(f"  Added vertebra #{comp['number']}: {comp['name']}")
-    else:
-        print(f"  Added {comp['category']}: {comp['name']}")
-
-# Add labels for vertebrae
-print("\nAdding vertebra labels...")
-for vert in vertebrae:
-    center = vert['mesh'].center
-    plotter.add_point_labels(
-        [center],
-        [f"V{vert['number']}"],
-        font_size=20,
-        point_size=1,
-        text_color='yellow',
-        shape_opacity=0.5,
-        always_visible=False
-    )
-
-# Calculate scene bounds
-all_points = np.vstack([c['mesh'].points for c in components])
-bounds = [
-    all_points[:, 0].min(), all_points[:, 0].max(),
-    all_points[:, 1].min(), all_points[:, 1].max(),
-    all_points[:, 2].min(), all_points[:, 2].max()
-]
-center = [(bounds[i] + bounds[i+1]) / 2 for i in [0, 2, 4]]
-
-print(f"\nBounds: X=[{bounds[0]:.1f}, {bounds[1]:.1f}]")
-print(f"        Y=[{bounds[2]:.1f}, {bounds[3]:.1f}]")
-print(f"        Z=[{bounds[4]:.1f}, {bounds[5]:.1f}]")
-
-# ============================================================================
-# CLIPPING SYSTEM
-# ============================================================================
-
-clip_state = {
-    'x': None, 'y': None, 'z': None,
-    'x_on': False, 'y_on': False, 'z_on': False
-}
-
-def apply_clips():
-    """Apply active clipping planes to all actors"""
-    for actor in actors:
-        actor.mapper.RemoveAllClippingPlanes()
-        if clip_state['x_on'] and clip_state['x']:
-            actor.mapper.AddClippingPlane(clip_state['x'])
-        if clip_state['y_on'] and clip_state['y']:
-            actor.mapper.AddClippingPlane(clip_state['y'])
-        if clip_state['z_on'] and clip_state['z']:
-            actor.mapper.AddClippingPlane(clip_state['z'])
-
-def cb_x(normal, origin):
-    """Callback for X plane widget"""
-    plane = vtk.vtkPlane()
-    plane.SetNormal(1, 0, 0)
-    plane.SetOrigin(origin)
-    clip_state['x'] = plane
-    apply_clips()
-
-def cb_y(normal, origin):
-    """Callback for Y plane widget"""
-    plane = vtk.vtkPlane()
-    plane.SetNormal(0, 1, 0)
-    plane.SetOrigin(origin)
-    clip_state['y'] = plane
-    apply_clips()
-
-def cb_z(normal, origin):
-    """Callback for Z plane widget"""
-    plane = vtk.vtkPlane()
-    plane.SetNormal(0, 0, 1)
-    plane.SetOrigin(origin)
-    clip_state['z'] = plane
-    apply_clips()
-
-# Add plane widgets (start disabled)
-try:
-    wx = plotter.add_plane_widget(
-        callback=cb_x,
-        bounds=bounds,
-        normal=(1, 0, 0),
-        origin=center
-    )
-    wy = plotter.add_plane_widget(
-        callback=cb_y,
-        bounds=bounds,
-        normal=(0, 1, 0),
-        origin=center
-    )
-    wz = plotter.add_plane_widget(
-        callback=cb_z,
-        bounds=bounds,
-        normal=(0, 0, 1),
-        origin=center
-    )
+    def hides_others(self):
+        """True while focus mode hides everything but the focused vertebra"""
+        if self.focused_actor is not None and self.transparency_level == 4:
+            self.notify("⚠", "Other parts are hidden by focus mode (press R to reset)")
+            return True
+        return False
     
-    wx.SetEnabled(0)
-    wy.SetEnabled(0)
-    wz.SetEnabled(0)
+    def visibility_changed(self):
+        """Called by the category toggles after they change visibility"""
+        self.others_visible = None
+        self.scene_is_reset = False
     
-    print("\n✅ Clipping widgets initialized")
-except Exception as e:
-    print(f"\n⚠ Plane widgets error: {e}")
-    wx = wy = wz = None
-
-# Keyboard controls for clipping
-def toggle_x():
-    if wx is None:
-        return
-    clip_state['x_on'] = not clip_state['x_on']
-    wx.SetEnabled(1 if clip_state['x_on'] else 0)
-    status = 'ON' if clip_state['x_on'] else 'OFF'
-    print(f"🔴 Sagittal clipping (X): {status}")
-    if clip_state['x_on']:
-        cb_x(wx.GetNormal(), wx.GetOrigin())
-    else:
-        apply_clips()
-
-def toggle_y():
-    if wy is None:
-        return
-    clip_state['y_on'] = not clip_state['y_on']
-    wy.SetEnabled(1 if clip_state['y_on'] else 0)
-    status = 'ON' if clip_state['y_on'] else 'OFF'
-    print(f"🟢 Coronal clipping (Y): {status}")
-    if clip_state['y_on']:
-        cb_y(wy.GetNormal(), wy.GetOrigin())
-    else:
-        apply_clips()
-
-def toggle_z():
-    if wz is None:
-        return
-    clip_state['z_on'] = not clip_state['z_on']
-    wz.SetEnabled(1 if clip_state['z_on'] else 0)
-    status = 'ON' if clip_state['z_on'] else 'OFF'
-    print(f"🔵 Axial clipping (Z): {status}")
-    if clip_state['z_on']:
-        cb_z(wz.GetNormal(), wz.GetOrigin())
-    else:
-        apply_clips()
-
-def clear_all():
-    if wx is None:
-        return
-    clip_state.update({'x_on': False, 'y_on': False, 'z_on': False})
-    wx.SetEnabled(0)
-    wy.SetEnabled(0)
-    wz.SetEnabled(0)
-    for actor in actors:
-        actor.mapper.RemoveAllClippingPlanes()
-    print("🧹 All clipping cleared")
-
-plotter.add_key_event('x', toggle_x)
-plotter.add_key_event('y', toggle_y)
-plotter.add_key_event('z', toggle_z)
-plotter.add_key_event('c', clear_all)
-
-# ============================================================================
-# VISIBILITY CONTROLS
-# ============================================================================
-
-visibility_state = {'muscles': True, 'vertebrae': True, 'spinal_cord': True}
-
-def toggle_muscles():
-    """Toggle muscles visibility"""
-    visibility_state['muscles'] = not visibility_state['muscles']
-    status = 'ON' if visibility_state['muscles'] else 'OFF'
-    print(f"💪 Muscles visibility: {status}")
+    def focus_on_vertebra_number(self, vert_num):
+        """Focus on specific vertebra by its number"""
+        found = self.vertebrae_by_number.get(vert_num)
+        if not found:
+            self.notify("⚠", f"Vertebra #{vert_num} not found!")
+            return
+        
+        self.current_focus = vert_num
+        self.scene_is_reset = False
+        self.notify("🎯", f"Focus on VERTEBRA #{vert_num}: {found['name']}")
+        
+        if found['actor'] is not self.focused_actor:
+            if self.focused_actor is not None:
+                self.focused_actor.prop = self.palette_props[id(self.focused_actor)]
+            self.focused_actor = found['actor']
+            self.focused_actor.prop = self.focus_prop
+            i = found['index']
+            self.other_actors = self.vertebra_actors[:i] + self.vertebra_actors[i + 1:]
+            self.others_visible = None
+        
+        # Apply transparency based on current level
+        self.apply_transparency_level()
+        
+        # Move camera to vertebra straight through vtkCamera
+        mesh_center = found['center']
+        camera = self.plotter.renderer.GetActiveCamera()
+        camera.SetPosition(mesh_center[0] + 150, mesh_center[1] + 150, mesh_center[2] + 150)
+        camera.SetFocalPoint(*mesh_center)
+        camera.SetViewUp(0, 0, 1)
+        camera.Zoom(2.5)
+        self.plotter.renderer.ResetCameraClippingRange()
+        self.request_render()
     
-    for comp in components:
-        if comp['category'] == 'muscle':
-            comp['actor'].SetVisibility(visibility_state['muscles'])
-    plotter.render()
-
-def toggle_vertebrae():
-    """Toggle vertebrae visibility"""
-    visibility_state['vertebrae'] = not visibility_state['vertebrae']
-    status = 'ON' if visibility_state['vertebrae'] else 'OFF'
-    print(f"🦴 Vertebrae visibility: {status}")
+    def apply_transparency_level(self):
+        """Apply current transparency level to all objects"""
+        # Everything here keys off the focused actor itself; the vertebra
+        # number is only needed for PgUp/PgDn navigation
+        if self.focused_actor is None:
+            return
+        
+        other_opacity = OPACITY_LEVELS.get(self.transparency_level, 0.25)
+        if other_opacity != self.last_other_opacity:
+            for prop in self.shared_props.values():
+                prop.opacity = other_opacity
+            self.last_other_opacity = other_opacity
+        
+        self.focused_actor.SetVisibility(True)
+        visible = self.transparency_level != 4
+        if visible != self.others_visible:
+            # The focused vertebra sits in the vertebra assembly, so that one
+            # stays on and only the other vertebrae are switched one by one
+            for category, assembly in self.assemblies.items():
+                assembly.SetVisibility(visible or category == 'vertebra')
+            for actor in self.other_actors:
+                actor.SetVisibility(visible)
+            self.others_visible = visible
+        
+        self.request_render()
     
-    for comp in components:
-        if comp['category'] == 'vertebra':
-            comp['actor'].SetVisibility(visibility_state['vertebrae'])
-    plotter.render()
-
-def toggle_spinal_cord():
-    """Toggle spinal cord visibility"""
-    visibility_state['spinal_cord'] = not visibility_state['spinal_cord']
-    status = 'ON' if visibility_state['spinal_cord'] else 'OFF'
-    print(f"🧠 Spinal cord visibility: {status}")
-    
-    for comp in components:
-        if comp['category'] == 'spinal_cord':
-            comp['actor'].SetVisibility(visibility_state['spinal_cord'])
-    plotter.render()
-
-plotter.add_key_event('m', toggle_muscles)
-plotter.add_key_event('v', toggle_vertebrae)
-plotter.add_key_event('t', toggle_spinal_cord)
-
-# ============================================================================
-# FOCUS NAVIGATION - FOCUS ON VERTEBRAE BY NUMBER
-# ============================================================================
-
-current_focus = None
-transparency_level = 2  # Default transparency level (1=light, 2=medium, 3=high, 4=hide)
-
-def focus_on_vertebra_number(vert_num):
-    """Focus on specific vertebra by its number"""
-    global current_focus
-    
-    found = None
-    for vert in vertebrae:
-        if vert['number'] == vert_num:
-            found = vert
-            break
-    
-    if not found:
-        print(f"⚠ Vertebra #{vert_num} not found!")
-        return
-    
-    current_focus = vert_num
-    print(f"🎯 Focus on VERTEBRA #{vert_num}: {found['name']}")
-    
-    # Apply transparency based on current level
-    apply_transparency_level()
-    
-    # Move camera to vertebra
-    mesh_center = found['mesh'].center
-    plotter.camera_position = [
-        (mesh_center[0] + 150, mesh_center[1] + 150, mesh_center[2] + 150),
-        tuple(mesh_center),
-        (0, 0, 1)
-    ]
-    plotter.camera.zoom(2.5)
-    plotter.render()
-
-def apply_transparency_level():
-    """Apply current transparency level to all objects"""
-    global current_focus, transparency_level
+    def increase_transparency(self):
+        """Increase transparency of non-focused parts"""
+        self.step_transparency(+1)
     
-    if current_focus is None:
-        return
+    def decrease_transparency(self):
+        """Decrease transparency of non-focused parts"""
+        self.step_transparency(-1)
     
-    # Define opacity levels for different transparency settings
-    opacity_levels = {
-        1: 0.5,   # Light transparency
-        2: 0.25,  # Medium transparency
-        3: 0.1,   # High transparency
-        4: 0.0    # Hidden
-    }
+    def step_transparency(self, step):
+        if self.focused_actor is None:
+            self.notify("⚠", "Focus on a vertebra first (use numbers or Page Up/Down)")
+            return
+        
+        previous_level = self.transparency_level
+        self.transparency_level = min(4, max(1, self.transparency_level + step))
+        self.notify("👁", f"Transparency level: {LEVEL_NAMES[self.transparency_level]}")
+        if self.transparency_level != previous_level:
+            self.apply_transparency_level()
     
-    other_opacity = opacity_levels.get(transparency_level, 0.25)
+    def reset_focus(self):
+        """Reset to show all objects"""
+        self.current_focus = None
+        self.transparency_level = 2  # Reset to medium
+        self.focused_actor = None
+        self.other_actors = []
+        self.notify("🔄", "Reset focus - showing all objects")
+        
+        if not self.scene_is_reset:
+            for prop in self.shared_props.values():
+                prop.opacity = 1.0
+            self.last_other_opacity = None
+            
+            for actor, prop in self.reset_plan:
+                actor.prop = prop
+                actor.SetVisibility(True)
+            for assembly in self.assemblies.values():
+                assembly.SetVisibility(True)
+            self.others_visible = None
+            self.scene_is_reset = True
+        
+        self.plotter.reset_camera(render=False)
+        self.plotter.camera.zoom(1.3)
+        self.request_render()
     
-    for comp in components:
-        if comp['category'] == 'vertebra' and comp.get('number') == current_focus:
-            comp['actor'].prop.opacity = 1.0
-            comp['actor'].prop.color = (1.0, 0.85, 0.2)  # Bright yellow
-            comp['actor'].SetVisibility(True)
+    def next_vertebra(self):
+        """Focus on next vertebra"""
+        if self.current_focus is None:
+            self.focus_on_vertebra_number(1)
         else:
-            comp['actor'].prop.opacity = other_opacity
-            if transparency_level == 4:
-                comp['actor'].SetVisibility(False)
+            next_num = self.current_focus + 1
+            if next_num <= self.max_vertebra_num:
+                self.focus_on_vertebra_number(next_num)
             else:
-                comp['actor'].SetVisibility(True)
+                self.notify("⚠", f"Already at last vertebra #{self.max_vertebra_num}")
     
-    plotter.render()
-
-def increase_transparency():
-    """Increase transparency of non-focused parts"""
-    global transparency_level
-    if current_focus is None:
-        print("⚠ Focus on a vertebra first (use numbers or Page Up/Down)")
-        return
-    
-    transparency_level = min(4, transparency_level + 1)
-    level_names = {1: "Light", 2: "Medium", 3: "High", 4: "Hidden"}
-    print(f"👁 Transparency level: {level_names[transparency_level]}")
-    apply_transparency_level()
-
-def decrease_transparency():
-    """Decrease transparency of non-focused parts"""
-    global transparency_level
-    if current_focus is None:
-        print("⚠ Focus on a vertebra first (use numbers or Page Up/Down)")
-        return
-    
-    transparency_level = max(1, transparency_level - 1)
-    level_names = {1: "Light", 2: "Medium", 3: "High", 4: "Hidden"}
-    print(f"👁 Transparency level: {level_names[transparency_level]}")
-    apply_transparency_level()
+    def prev_vertebra(self):
+        """Focus on previous vertebra"""
+        if self.current_focus is None:
+            self.focus_on_vertebra_number(self.max_vertebra_num)
+        else:
+            prev_num = self.current_focus - 1
+            if prev_num >= 1:
+                self.focus_on_vertebra_number(prev_num)
+            else:
+                self.notify("⚠", "Already at first vertebra #1")
 
-def reset_focus():
-    """Reset to show all objects"""
-    global current_focus, transparency_level
-    current_focus = None
-    transparency_level = 2  # Reset to medium
-    print("🔄 Reset focus - showing all objects")
+def main():
+    # Force on-screen rendering
+    os.environ['PYVISTA_OFF_SCREEN'] = '0'
+    pv.OFF_SCREEN = False
+    pv.global_theme.multi_samples = 4
+    
+    print("="*70)
+    print("HIGH QUALITY SPINE, SPINAL CORD & MUSCLES VISUALIZATION")
+    print("="*70)
+    
+    # Load muscles
+    muscles = load_obj_files(MUSCLES_PATH, "muscle")
+    
+    # Load vertebrae (bones)
+    vertebrae = load_obj_files(VERTEBRAE_PATH, "vertebra")
+    
+    # Load spinal cord
+    spinal_cord = load_obj_files(SPINAL_CORD_PATH, "spinal_cord")
+    
+    # Sort vertebrae by Z coordinate and assign numbers
+    vertebrae.sort(key=lambda x: x['cz'], reverse=True)
+    for idx, vert in enumerate(vertebrae):
+        vert['number'] = idx + 1
+        vert['center'] = tuple(vert['mesh'].center)
+    
+    # Combine all components
+    components = vertebrae + spinal_cord + muscles
+    
+    print(f"\n✅ Total loaded: {len(components)} objects")
+    print(f"   - {len(vertebrae)} vertebrae (numbered 1-{len(vertebrae)})")
+    print(f"   - {len(spinal_cord)} spinal cord")
+    print(f"   - {len(muscles)} muscles")
+    
+    if len(components) == 0:
+        print("❌ No objects found!")
+        exit(1)
+    
+    # Create plotter
+    plotter = pv.Plotter(window_size=(1920, 1080))
+    plotter.set_background((0.1, 0.12, 0.15))
+    
+    # Enable quality features
+    edl_enabled = False
+    try:
+        plotter.enable_anti_aliasing()
+        plotter.enable_eye_dome_lighting()
+        edl_enabled = True
+    except:
+        print("⚠ Some rendering features not available")
+    
+    # Add objects to scene
+    actors = []
+    reset_plan = []  # (actor, palette property) pairs restored by reset_focus
+    actors_by_category = {'muscle': [], 'vertebra': [], 'spinal_cord': []}
+    # One assembly per category, so hiding a whole category is a single
+    # SetVisibility call instead of one per part
+    assemblies = {category: vtk.vtkAssembly() for category in actors_by_category}
+    vertebra_colors = [
+        (0.92, 0.72, 0.52),
+        (0.88, 0.68, 0.48),
+        (0.84, 0.64, 0.44),
+        (0.90, 0.70, 0.50),
+        (0.86, 0.66, 0.46),
+    ]
+    
+    # Lighter red colors for muscles
+    muscle_colors = [
+        (1.0, 0.5, 0.5),
+        (1.0, 0.55, 0.55),
+        (0.95, 0.45, 0.45),
+        (1.0, 0.6, 0.6),
+        (0.98, 0.52, 0.52),
+    ]
     
+    spinal_cord_colors = [
+        (0.95, 0.95, 0.95),
+        (0.90, 0.90, 0.92),
+        (0.92, 0.92, 0.94),
+        (0.94, 0.94, 0.96),
+    ]
+    
+    # Parts with the same colour share one property, so opacity changes
+    # touch a handful of properties instead of every actor
+    shared_props = {}
+    
+    print("\nAdding objects to scene...")
     vertebra_idx = 0
     muscle_idx = 0
     spinal_idx = 0
     
     for comp in components:
-        comp['actor'].prop.opacity = 1.0
-        comp['actor'].SetVisibility(True)
         if comp['category'] == 'vertebra':
-            comp['actor'].prop.color = vertebra_colors[vertebra_idx % len(vertebra_colors)]
+            color = vertebra_colors[vertebra_idx % len(vertebra_colors)]
             vertebra_idx += 1
         elif comp['category'] == 'spinal_cord':
-            comp['actor'].prop.color = spinal_cord_colors[spinal_idx % len(spinal_cord_colors)]
+            color = spinal_cord_colors[spinal_idx % len(spinal_cord_colors)]
             spinal_idx += 1
-        else:
-            comp['actor'].prop.color = muscle_colors[muscle_idx % len(muscle_colors)]
+        else:  # muscle
+            color = muscle_colors[muscle_idx % len(muscle_colors)]
             muscle_idx += 1
+        
+        # Build the actor directly instead of add_mesh, which runs the
+        # remove-existing/name lookup for every part
+        mapper = pv.DataSetMapper(comp['mesh'])
+        mapper.scalar_visibility = False
+        if color not in shared_props:
+            shared_props[color] = make_prop(color)
+        actor = pv.Actor(mapper=mapper, prop=shared_props[color])
+        assemblies[comp['category']].AddPart(actor)
+        
+        comp['index'] = len(actors_by_category[comp['category']])
+        actors.append(actor)
+        actors_by_category[comp['category']].append(actor)
+        comp['actor'] = actor
+        reset_plan.append((actor, shared_props[color]))
+        
+        if comp['category'] == 'vertebra':
+            print(f"  Added vertebra #{comp['number']}: {comp['name']}")
+        else:
+            print(f"  Added {comp['category']}: {comp['name']}")
+    
+    for category, assembly in assemblies.items():
+        if actors_by_category[category]:
+            plotter.add_actor(assembly, reset_camera=False, render=False,
+                              remove_existing_actor=False)
+    
+    # Add labels for vertebrae (one labels actor for all of them)
+    print("\nAdding vertebra labels...")
+    if vertebrae:
+        vert_bounds = np.array([vert['mesh'].bounds for vert in vertebrae])
+        label_points = 0.5 * (vert_bounds[:, 0::2] + vert_bounds[:, 1::2])
+        plotter.add_point_labels(
+            label_points,
+            [f"V{vert['number']}" for vert in vertebrae],
+            font_size=20,
+            point_size=1,
+            text_color='yellow',
+            shape_opacity=0.5,
+            always_visible=False
+        )
+    
+    # Calculate scene bounds from the per-mesh bounds (no copy of all vertices)
+    mesh_bounds = np.array([c['mesh'].bounds for c in components])
+    bounds = [
+        mesh_bounds[:, 0].min(), mesh_bounds[:, 1].max(),
+        mesh_bounds[:, 2].min(), mesh_bounds[:, 3].max(),
+        mesh_bounds[:, 4].min(), mesh_bounds[:, 5].max()
+    ]
+    center = [(bounds[i] + bounds[i+1]) / 2 for i in [0, 2, 4]]
+    
+    print(f"\nBounds: X=[{bounds[0]:.1f}, {bounds[1]:.1f}]")
+    print(f"        Y=[{bounds[2]:.1f}, {bounds[3]:.1f}]")
+    print(f"        Z=[{bounds[4]:.1f}, {bounds[5]:.1f}]")
+    
+    # ============================================================================
+    # CLIPPING SYSTEM
+    # ============================================================================
+    
+    clip_state = {'x_on': False, 'y_on': False, 'z_on': False}
+    
+    # Clipping planes are created once; the widgets only move their origins
+    plane_x = vtk.vtkPlane()
+    plane_x.SetNormal(1, 0, 0)
+    plane_y = vtk.vtkPlane()
+    plane_y.SetNormal(0, 1, 0)
+    plane_z = vtk.vtkPlane()
+    plane_z.SetNormal(0, 0, 1)
+    for plane in (plane_x, plane_y, plane_z):
+        plane.SetOrigin(center)
+    
+    # One plane collection shared by every mapper, so updating the clipping
+    # only edits the collection instead of touching each actor
+    clip_planes = vtk.vtkPlaneCollection()
+    for actor in actors:
+        actor.mapper.SetClippingPlanes(clip_planes)
+    
+    def apply_clips():
+        """Apply active clipping planes to all actors"""
+        clip_planes.RemoveAllItems()
+        for axis, plane in (('x', plane_x), ('y', plane_y), ('z', plane_z)):
+            if clip_state[axis + '_on']:
+                clip_planes.AddItem(plane)
+        clip_planes.Modified()
+    
+    def cb_x(normal, origin):
+        """Callback for X plane widget"""
+        plane_x.SetOrigin(origin)
+        clip_planes.Modified()
+    
+    def cb_y(normal, origin):
+        """Callback for Y plane widget"""
+        plane_y.SetOrigin(origin)
+        clip_planes.Modified()
+    
+    def cb_z(normal, origin):
+        """Callback for Z plane widget"""
+        plane_z.SetOrigin(origin)
+        clip_planes.Modified()
+    
+    # Add plane widgets (start disabled)
+    try:
+        wx = plotter.add_plane_widget(
+            callback=cb_x,
+            bounds=bounds,
+            normal=(1, 0, 0),
+            origin=center,
+            interaction_event='end'
+        )
+        wy = plotter.add_plane_widget(
+            callback=cb_y,
+            bounds=bounds,
+            normal=(0, 1, 0),
+            origin=center,
+            interaction_event='end'
+        )
+        wz = plotter.add_plane_widget(
+            callback=cb_z,
+            bounds=bounds,
+            normal=(0, 0, 1),
+            origin=center,
+            interaction_event='end'
+        )
+        
+        wx.SetEnabled(0)
+        wy.SetEnabled(0)
+        wz.SetEnabled(0)
+        
+        print("\n✅ Clipping widgets initialized")
+    except Exception as e:
+        print(f"\n⚠ Plane widgets error: {e}")
+        wx = wy = wz = None
+    
+    # The callbacks above only fire on release; while dragging just move
+    # the plane origin so the cut follows the widget without extra work
+    def follow_plane(plane):
+        def on_drag(widget, event):
+            plane.SetOrigin(widget.GetOrigin())
+        return on_drag
+    
+    if wx is not None:
+        for widget, plane in ((wx, plane_x), (wy, plane_y), (wz, plane_z)):
+            widget.AddObserver('InteractionEvent', follow_plane(plane))
+    
+    # Eye-dome lighting is an extra full-screen pass every frame: drop it
+    # while a plane widget is dragged and bring it back on release
+    def suspend_edl(widget, event):
+        plotter.disable_eye_dome_lighting()
+    
+    def restore_edl(widget, event):
+        plotter.enable_eye_dome_lighting()
+    
+    if edl_enabled and wx is not None:
+        for widget in (wx, wy, wz):
+            widget.AddObserver('StartInteractionEvent', suspend_edl)
+            widget.AddObserver('EndInteractionEvent', restore_edl)
+    
+    # Key handlers only ask for a frame; a one-shot timer then draws once
+    # for a whole burst of key presses instead of once per handler
+    render_pending = False
+    
+    def request_render():
+        nonlocal render_pending
+        if not render_pending:
+            render_pending = True
+            plotter.iren.create_timer(16, repeating=False)
+    
+    def do_render(obj, event):
+        nonlocal render_pending
+        if render_pending:
+            render_pending = False
+            plotter.render()
+    
+    plotter.iren.add_observer('TimerEvent', do_render)
+    
+    # Key feedback goes to a status line under the info text; printing
+    # (emoji included) can stall slow consoles, so it is opt-in via VERBOSE
+    def notify(icon, message):
+        if VERBOSE:
+            print(f"{icon} {message}")
+        info_actor.SetText(3, f"{info_text}\n{message}")
+        request_render()
+    
+    # Keyboard controls for clipping
+    def toggle_x():
+        if wx is None:
+            return
+        clip_state['x_on'] = not clip_state['x_on']
+        wx.SetEnabled(1 if clip_state['x_on'] else 0)
+        status = 'ON' if clip_state['x_on'] else 'OFF'
+        notify("🔴", f"Sagittal clipping (X): {status}")
+        if clip_state['x_on']:
+            cb_x(wx.GetNormal(), wx.GetOrigin())
+        apply_clips()
+    
+    def toggle_y():
+        if wy is None:
+            return
+        clip_state['y_on'] = not clip_state['y_on']
+        wy.SetEnabled(1 if clip_state['y_on'] else 0)
+        status = 'ON' if clip_state['y_on'] else 'OFF'
+        notify("🟢", f"Coronal clipping (Y): {status}")
+        if clip_state['y_on']:
+            cb_y(wy.GetNormal(), wy.GetOrigin())
+        apply_clips()
+    
+    def toggle_z():
+        if wz is None:
+            return
+        clip_state['z_on'] = not clip_state['z_on']
+        wz.SetEnabled(1 if clip_state['z_on'] else 0)
+        status = 'ON' if clip_state['z_on'] else 'OFF'
+        notify("🔵", f"Axial clipping (Z): {status}")
+        if clip_state['z_on']:
+            cb_z(wz.GetNormal(), wz.GetOrigin())
+        apply_clips()
+    
+    def clear_all():
+        if wx is None:
+            return
+        clip_state.update({'x_on': False, 'y_on': False, 'z_on': False})
+        wx.SetEnabled(0)
+        wy.SetEnabled(0)
+        wz.SetEnabled(0)
+        apply_clips()
+        notify("🧹", "All clipping cleared")
+    
+    plotter.add_key_event('x', toggle_x)
+    plotter.add_key_event('y', toggle_y)
+    plotter.add_key_event('z', toggle_z)
+    plotter.add_key_event('c', clear_all)
+    
+    # ============================================================================
+    # VISIBILITY CONTROLS
+    # ============================================================================
+    
+    # Focus/transparency state; the visibility toggles below consult it too
+    focus = FocusController(plotter, vertebrae, actors_by_category, assemblies,
+                            shared_props, reset_plan, notify, request_render)
     
-    plotter.reset_camera()
+    visibility_state = {'muscles': True, 'vertebrae': True, 'spinal_cord': True}
+    
+    def toggle_muscles():
+        """Toggle muscles visibility"""
+        if focus.hides_others():
+            return
+        visibility_state['muscles'] = not visibility_state['muscles']
+        status = 'ON' if visibility_state['muscles'] else 'OFF'
+        notify("💪", f"Muscles visibility: {status}")
+        
+        assemblies['muscle'].SetVisibility(visibility_state['muscles'])
+        focus.visibility_changed()
+        request_render()
+    
+    def toggle_vertebrae():
+        """Toggle vertebrae visibility"""
+        if focus.hides_others():
+            return
+        visibility_state['vertebrae'] = not visibility_state['vertebrae']
+        status = 'ON' if visibility_state['vertebrae'] else 'OFF'
+        notify("🦴", f"Vertebrae visibility: {status}")
+        
+        assemblies['vertebra'].SetVisibility(visibility_state['vertebrae'])
+        focus.visibility_changed()
+        request_render()
+    
+    def toggle_spinal_cord():
+        """Toggle spinal cord visibility"""
+        if focus.hides_others():
+            return
+        visibility_state['spinal_cord'] = not visibility_state['spinal_cord']
+        status = 'ON' if visibility_state['spinal_cord'] else 'OFF'
+        notify("🧠", f"Spinal cord visibility: {status}")
+        
+        assemblies['spinal_cord'].SetVisibility(visibility_state['spinal_cord'])
+        focus.visibility_changed()
+        request_render()
+    
+    plotter.add_key_event('m', toggle_muscles)
+    plotter.add_key_event('v', toggle_vertebrae)
+    plotter.add_key_event('t', toggle_spinal_cord)
+    
+    # ============================================================================
+    # FOCUS NAVIGATION - FOCUS ON VERTEBRAE BY NUMBER
+    # ============================================================================
+    
+    plotter.add_key_event('r', focus.reset_focus)
+    
+    # Add transparency controls
+    plotter.add_key_event('plus', focus.increase_transparency)
+    plotter.add_key_event('equal', focus.increase_transparency)  # For keyboards without numpad
+    plotter.add_key_event('minus', focus.decrease_transparency)
+    
+    # Bind number keys 1-9 to vertebrae
+    for i in range(1, min(10, len(vertebrae) + 1)):
+        plotter.add_key_event(str(i), partial(focus.focus_on_vertebra_number, i))
+    
+    # Navigation with Page Up/Down
+    plotter.add_key_event('Next', focus.next_vertebra)  # Page Down
+    plotter.add_key_event('Prior', focus.prev_vertebra)  # Page Up
+    
+    # ============================================================================
+    # CAMERA AND UI
+    # ============================================================================
+    
+    # Set initial camera
+    plotter.camera_position = 'iso'
+    plotter.reset_camera(render=False)
     plotter.camera.zoom(1.3)
-    plotter.render()
-
-plotter.add_key_event('r', reset_focus)
-
-# Add transparency controls
-plotter.add_key_event('plus', increase_transparency)
-plotter.add_key_event('equal', increase_transparency)  # For keyboards without numpad
-plotter.add_key_event('minus', decrease_transparency)
-
-# Bind number keys 1-9 to vertebrae
-def make_focus_callback(vertebra_num):
-    """Create a callback function for a specific vertebra number"""
-    def callback():
-        focus_on_vertebra_number(vertebra_num)
-    return callback
-
-for i in range(1, min(10, len(vertebrae) + 1)):
-    plotter.add_key_event(str(i), make_focus_callback(i))
-
-# Navigation with Page Up/Down
-def next_vertebra():
-    """Focus on next vertebra"""
-    global current_focus
-    if current_focus is None:
-        focus_on_vertebra_number(1)
-    else:
-        next_num = current_focus + 1
-        if next_num <= len(vertebrae):
-            focus_on_vertebra_number(next_num)
-        else:
-            print(f"⚠ Already at last vertebra #{len(vertebrae)}")
-
-def prev_vertebra():
-    """Focus on previous vertebra"""
-    global current_focus
-    if current_focus is None:
-        focus_on_vertebra_number(len(vertebrae))
-    else:
-        prev_num = current_focus - 1
-        if prev_num >= 1:
-            focus_on_vertebra_number(prev_num)
-        else:
-            print(f"⚠ Already at first vertebra #1")
-
-plotter.add_key_event('Next', next_vertebra)  # Page Down
-plotter.add_key_event('Prior', prev_vertebra)  # Page Up
-
-# ============================================================================
-# CAMERA AND UI
-# ============================================================================
-
-# Set initial camera
-plotter.camera_position = 'iso'
-plotter.reset_camera()
-plotter.camera.zoom(1.3)
-
-# Add axes and grid
-plotter.add_axes(line_width=3, labels_off=False)
-plotter.show_grid(color='gray')
-
-# Instructions text
-instructions = """CONTROLS:
+    
+    # Add axes and grid
+    plotter.add_axes(line_width=3, labels_off=False)
+    plotter.show_grid(color='gray')
+    
+    # Instructions text
+    instructions = """CONTROLS:
 [X] Sagittal plane
 [Y] Coronal plane
 [Z] Axial plane
@@ -558,55 +705,59 @@ instructions = """CONTROLS:
 [1-9] Focus vertebra #
 [PgUp/PgDn] Next/Prev
 [+/-] Transparency"""
+    
+    plotter.add_text(
+        instructions,
+        position='upper_left',
+        font_size=11,
+        color='white',
+        font='courier'
+    )
+    
+    info_text = f"{len(vertebrae)} Vertebrae | {len(spinal_cord)} Spinal Cord | {len(muscles)} Muscles"
+    info_actor = plotter.add_text(
+        info_text,
+        position='upper_right',
+        font_size=12,
+        color='yellow'
+    )
+    
+    # Print vertebrae list
+    print("\n" + "="*70)
+    print("VERTEBRAE LIST:")
+    for vert in vertebrae:
+        print(f"  Vertebra #{vert['number']:2d} - {vert['name']}")
+    print("="*70)
+    
+    # Print controls
+    print("\nKEYBOARD CONTROLS:")
+    print("  [X] = Sagittal clipping (Left/Right)")
+    print("  [Y] = Coronal clipping (Front/Back)")
+    print("  [Z] = Axial clipping (Top/Bottom)")
+    print("  [C] = Clear all clipping")
+    print("  [M] = Toggle muscles visibility")
+    print("  [V] = Toggle vertebrae visibility")
+    print("  [T] = Toggle spinal cord visibility")
+    print("  [R] = Reset focus")
+    print("  [1-9] = Focus on vertebra by number")
+    print("  [Page Up] = Previous vertebra")
+    print("  [Page Down] = Next vertebra")
+    print("  [+] = Increase transparency (hide outer parts)")
+    print("  [-] = Decrease transparency (show outer parts)")
+    print("="*70)
+    print("MOUSE CONTROLS:")
+    print("  Left-drag = Rotate")
+    print("  Right-drag = Pan")
+    print("  Scroll = Zoom")
+    print("="*70)
+    print("\n🎨 Opening visualization window...")
+    print("="*70)
+    
+    # Show the window
+    plotter.show()
+    
+    print("\n✅ Visualization closed. Done!")
+    
 
-plotter.add_text(
-    instructions,
-    position='upper_left',
-    font_size=11,
-    color='white',
-    font='courier'
-)
-
-info_text = f"{len(vertebrae)} Vertebrae | {len(spinal_cord)} Spinal Cord | {len(muscles)} Muscles"
-plotter.add_text(
-    info_text,
-    position='upper_right',
-    font_size=12,
-    color='yellow'
-)
-
-# Print vertebrae list
-print("\n" + "="*70)
-print("VERTEBRAE LIST:")
-for vert in vertebrae:
-    print(f"  Vertebra #{vert['number']:2d} - {vert['name']}")
-print("="*70)
-
-# Print controls
-print("\nKEYBOARD CONTROLS:")
-print("  [X] = Sagittal clipping (Left/Right)")
-print("  [Y] = Coronal clipping (Front/Back)")
-print("  [Z] = Axial clipping (Top/Bottom)")
-print("  [C] = Clear all clipping")
-print("  [M] = Toggle muscles visibility")
-print("  [V] = Toggle vertebrae visibility")
-print("  [T] = Toggle spinal cord visibility")
-print("  [R] = Reset focus")
-print("  [1-9] = Focus on vertebra by number")
-print("  [Page Up] = Previous vertebra")
-print("  [Page Down] = Next vertebra")
-print("  [+] = Increase transparency (hide outer parts)")
-print("  [-] = Decrease transparency (show outer parts)")
-print("="*70)
-print("MOUSE CONTROLS:")
-print("  Left-drag = Rotate")
-print("  Right-drag = Pan")
-print("  Scroll = Zoom")
-print("="*70)
-print("\n🎨 Opening visualization window...")
-print("="*70)
-
-# Show the window
-plotter.show()
-
-print("\n✅ Visualization closed. Done!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
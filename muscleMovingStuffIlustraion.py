@@ -1,11 +1,22 @@
 import os
+import math
+import time
 import glob
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pyvista as pv
+import vtk
 from PyQt5 import QtWidgets, QtCore
 from pyvistaqt import BackgroundPlotter
 import sys
 
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 """
 🦴 Spinal Cord & Muscles Movement - Complete Anatomical Movement
 Vertebrae, Spinal Cord, and Surrounding Muscles moving in harmony
@@ -32,6 +43,27 @@ ANATOMICAL_COLORS = {
     'default': (0.90, 0.90, 0.90),     # Gray
 }
 
+# Parts above this many points are decimated down to it for the realtime animation
+MAX_VERTS_PER_PART = 30000
+
+# Prepared meshes are cached here, keyed by source path, size, mtime and vertex budget
+MESH_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'medviz_spine_meshes')
+
+# Frames where no vertex would move further than this (world units) are skipped
+MIN_VISIBLE_MOVE = 0.05
+
+# Apply the movement in a vertex shader; False moves the points on the CPU instead
+GPU_DISPLACEMENT = True
+
+# Vertex shader hooks: position = orig + dispA * moveK + dispB * moveK^2
+# (moveK and dispB are custom uniforms, dispA a per-vertex attribute)
+MOVEMENT_VS_DEC = "//VTK::PositionVC::Dec\nin vec3 dispA;"
+MOVEMENT_VS_IMPL = (
+    "vec4 movedMC = vec4(vertexMC.xyz + dispA * moveK + dispB * (moveK * moveK), 1.0);\n"
+    "  vertexVCVSOutput = MCVCMatrix * movedMC;\n"
+    "  gl_Position = MCDCMatrix * movedMC;"
+)
+
 # Movement configurations for different anatomical parts
 MOVING_PARTS = {
     # Spinal cord - Central nervous system
@@ -170,6 +202,107 @@ def get_movement_config(region: str):
     return MOVING_PARTS.get(region, MOVING_PARTS['default'])
 
 
+def find_obj_files(folder):
+    """Sorted .obj paths in folder (any extension case), in one directory pass"""
+    return sorted(
+        entry.path for entry in os.scandir(folder)
+        if entry.is_file() and entry.name.lower().endswith('.obj')
+    )
+
+
+def load_part_mesh(path):
+    """Read, clean, decimate and orient normals for one OBJ, reusing the .vtp cache.
+    
+    The auto_orient_normals flood fill only runs on a cache miss; cached meshes
+    come back with their oriented point normals. Returns None for an empty mesh.
+    """
+    # Hash the absolute path so same-named files in different folders don't collide
+    source_key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    stat = os.stat(path)
+    cache_path = os.path.join(
+        MESH_CACHE_DIR,
+        f"{source_key}.{stat.st_size}.{stat.st_mtime_ns}.{MAX_VERTS_PER_PART}.vtp"
+    )
+    if os.path.exists(cache_path):
+        try:
+            return pv.read(cache_path)
+        except Exception:
+            pass
+    
+    mesh = pv.read(path)
+    if mesh.n_points == 0:
+        return None
+    
+    mesh = mesh.clean()
+    if mesh.n_points > MAX_VERTS_PER_PART:
+        mesh = mesh.triangulate().decimate_pro(
+            1.0 - MAX_VERTS_PER_PART / mesh.n_points, preserve_topology=True)
+    # Smooth shading only reads point normals, so skip the cell normals pass
+    mesh = mesh.compute_normals(auto_orient_normals=True, cell_normals=False)
+    
+    try:
+        os.makedirs(MESH_CACHE_DIR, exist_ok=True)
+        # Drop entries left over from older versions of this source file
+        for stale in glob.glob(os.path.join(MESH_CACHE_DIR, f"{source_key}.*.vtp")):
+            if stale != cache_path:
+                os.remove(stale)
+        mesh.save(cache_path, binary=True)
+    except Exception:
+        pass
+    
+    return mesh
+
+
+def movement_basis(config, points, center):
+    """Per-part displacement basis for one unit of sin(2*pi*f*t) * global amplitude.
+
+    Every movement type reduces to ``points + disp_A * k + disp_B * k * k``.
+    ``disp_A`` is an (N, 3) field for the scaling movements and a single
+    broadcast (3,) vector for the translations; ``disp_B`` is only needed for
+    breathing, where the lift is scaled along with the rest of the mesh.
+    """
+    movement_type = config.get('movement_type', 'subtle_wave')
+    amp = config.get('amplitude', 4.0)
+    vectors = np.asarray(points, dtype=np.float64) - center
+    up = np.array([0.0, 0.0, 1.0])
+    
+    if movement_type == 'pulsation':
+        disp_a = vectors * (amp / 100.0)
+    elif movement_type == 'subtle_pulse':
+        disp_a = vectors * (amp / 200.0)
+    elif movement_type == 'gentle_pulse':
+        disp_a = vectors * (amp / 150.0)
+    elif movement_type == 'breathing':
+        disp_a = vectors * (amp / 300.0) + up * amp
+        return disp_a.astype(np.float32), (up * (amp * amp / 300.0)).astype(np.float32)
+    elif movement_type == 'gentle_wave':
+        disp_a = np.array([0.3, 0.0, 0.5]) * amp
+    elif movement_type == 'wave':
+        disp_a = np.array([1.0, 0.0, 0.5]) * amp
+    elif movement_type == 'oscillate':
+        disp_a = np.array([1.0, 0.3, 0.0]) * amp
+    elif movement_type == 'gentle_sway':
+        disp_a = np.array([0.3, 0.2, 0.0]) * amp
+    elif movement_type == 'subtle_wave':
+        disp_a = np.array([0.0, 0.2, 0.4]) * amp
+    else:
+        disp_a = np.zeros(3)
+    
+    return disp_a.astype(np.float32), None
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _movement_kernel(orig, disp_a, disp_b, part_index, factors, out):
+        """orig + A*k + B*k^2 over the concatenated vertices of all parts"""
+        for i in prange(orig.shape[0]):
+            p = part_index[i]
+            k = factors[p]
+            kk = k * k
+            for j in range(3):
+                out[i, j] = orig[i, j] + disp_a[i, j] * k + disp_b[p, j] * kk
+
+
 class CompleteSpinalMovement(QtWidgets.QMainWindow):
     def __init__(self, spinal_files, muscle_files):
         super().__init__()
@@ -180,20 +313,31 @@ class CompleteSpinalMovement(QtWidgets.QMainWindow):
         # Animation
         self.is_animating = False
         self.time = 0.0
+        self.frame_interval = 0.033
+        self._last_t = 0.0
+        self._next_deadline = 0.0
         
         # Global controls - Defaults: 35% amplitude, 0.8x speed
         self.movement_enabled = True
         self.global_amplitude = 0.35
         self.speed_factor = 0.8
         
-        # Store originals
-        self.original_positions = {}
-        self.original_centers = {}
+        # Originals live on each part ('orig_points', 'original_center')
+        self._moving_parts = []
+        self._static_parts = []
+        self._gpu_uniforms = []
+        self._build_movement_buffers()
         
-        # Timer
+        # Timer - single shot, re-armed against a wall-clock deadline each frame
         self.timer = QtCore.QTimer()
+        self.timer.setSingleShot(True)
         self.timer.timeout.connect(self._update_movement)
-        self.timer.setInterval(33)
+        
+        # Apply slider values once a drag settles instead of on every step
+        self.slider_timer = QtCore.QTimer()
+        self.slider_timer.setSingleShot(True)
+        self.slider_timer.setInterval(30)
+        self.slider_timer.timeout.connect(self._apply_sliders)
         
         self.setWindowTitle("🦴 Spinal Cord & Muscles Movement")
         self.resize(1600, 900)
@@ -411,94 +555,82 @@ class CompleteSpinalMovement(QtWidgets.QMainWindow):
     
     def _load_meshes(self):
         loaded = 0
+        jobs = [(path, 'spinal') for path in self.spinal_files]
+        jobs += [(path, 'muscle') for path in self.muscle_files]
+        jobs = [(path, kind) for path, kind in jobs if is_surface_part(os.path.basename(path))]
         
-        # Load spinal cord files
-        for path in self.spinal_files:
-            if not is_surface_part(os.path.basename(path)):
-                continue
-            
+        # Reading, decimation and the movement basis run in threads; parts keep file order
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            futures = [pool.submit(self._load_one, path, kind) for path, kind in jobs]
+        
+        for (path, kind), future in zip(jobs, futures):
             try:
-                mesh = pv.read(path)
-                if mesh.n_points == 0:
-                    continue
-                
-                mesh = mesh.clean()
-                mesh = mesh.compute_normals(auto_orient_normals=True)
-                
-                name = os.path.basename(path)
-                region = classify_region(name)
-                color = ANATOMICAL_COLORS.get(region, ANATOMICAL_COLORS['default'])
-                movement_config = get_movement_config(region)
-                
-                self.parts.append({
-                    'name': name,
-                    'mesh': mesh,
-                    'color': color,
-                    'region': region,
-                    'original_center': np.array(mesh.center),
-                    'movement_config': movement_config,
-                    'actor': None,
-                    'type': 'spinal'
-                })
-                
-                loaded += 1
-                
+                part = future.result()
             except Exception as e:
-                print(f"Error loading spinal file: {e}")
-        
-        # Load muscle files
-        for path in self.muscle_files:
-            if not is_surface_part(os.path.basename(path)):
+                print(f"Error loading {kind} file: {e}")
                 continue
             
-            try:
-                mesh = pv.read(path)
-                if mesh.n_points == 0:
-                    continue
-                
-                mesh = mesh.clean()
-                mesh = mesh.compute_normals(auto_orient_normals=True)
-                
-                name = os.path.basename(path)
-                region = classify_region(name)
-                color = ANATOMICAL_COLORS.get(region, ANATOMICAL_COLORS['muscle'])
-                movement_config = get_movement_config(region)
-                
-                self.parts.append({
-                    'name': name,
-                    'mesh': mesh,
-                    'color': color,
-                    'region': region,
-                    'original_center': np.array(mesh.center),
-                    'movement_config': movement_config,
-                    'actor': None,
-                    'type': 'muscle'
-                })
-                
+            if part is not None:
+                self.parts.append(part)
                 loaded += 1
-                
-            except Exception as e:
-                print(f"Error loading muscle file: {e}")
         
         print(f"✅ Loaded {loaded} parts (ALL moving)")
     
+    def _load_one(self, path, part_type):
+        """Load one spinal or muscle OBJ into a part dict, or None if it is empty"""
+        mesh = load_part_mesh(path)
+        if mesh is None:
+            return None
+        
+        name = os.path.basename(path)
+        region = classify_region(name)
+        fallback = 'default' if part_type == 'spinal' else 'muscle'
+        color = ANATOMICAL_COLORS.get(region, ANATOMICAL_COLORS[fallback])
+        movement_config = get_movement_config(region)
+        center = np.array(mesh.center)
+        disp_a, disp_b = movement_basis(movement_config, mesh.points, center)
+        # An all-zero basis (zero amplitude, unknown movement type) never moves
+        moving = bool(movement_config.get('moves', True) and np.any(disp_a))
+        
+        return {
+            'name': name,
+            'mesh': mesh,
+            'color': color,
+            'region': region,
+            'original_center': center,
+            'movement_config': movement_config,
+            'disp_A': disp_a,
+            'disp_B': disp_b,
+            'moving': moving,
+            'actor': None,
+            'type': part_type
+        }
+    
     def _setup_scene(self):
         """Setup scene - SOLID meshes"""
+        # Static parts are drawn once and never enter the movement loop
+        self._moving_parts = [part for part in self.parts if part['moving']]
+        self._static_parts = [part for part in self.parts if not part['moving']]
+        
+        self._gpu_uniforms = []
         for part in self.parts:
-            actor = self.plotter.add_mesh(
-                part['mesh'],
-                color=part['color'],
-                opacity=1.0,
-                smooth_shading=True,
-                ambient=0.35,
-                diffuse=0.75,
-                specular=0.25,
-                specular_power=20
-            )
+            if GPU_DISPLACEMENT and part['moving']:
+                actor = self._add_displaced_actor(part)
+                self._gpu_uniforms.append(actor.GetShaderProperty().GetVertexCustomUniforms())
+            else:
+                actor = self.plotter.add_mesh(
+                    part['mesh'],
+                    color=part['color'],
+                    opacity=1.0,
+                    smooth_shading=True,
+                    ambient=0.35,
+                    diffuse=0.75,
+                    specular=0.25,
+                    specular_power=20
+                )
             part['actor'] = actor
-            
-            self.original_positions[part['name']] = part['mesh'].points.copy()
-            self.original_centers[part['name']] = part['original_center'].copy()
+        
+        self._build_movement_buffers()
         
         # Lighting
         self.plotter.remove_all_lights()
@@ -528,12 +660,112 @@ class CompleteSpinalMovement(QtWidgets.QMainWindow):
         
         print("✅ Scene ready")
     
+    def _add_displaced_actor(self, part):
+        """Actor whose vertex shader applies the part's displacement basis.
+        
+        disp_A is uploaded once as a per-vertex attribute and disp_B as a
+        uniform, so a frame only has to update the moveK uniform.
+        """
+        mesh = part['mesh']
+        disp_a = np.broadcast_to(part['disp_A'], (mesh.n_points, 3))
+        mesh.GetPointData().AddArray(
+            pv.convert_array(np.ascontiguousarray(disp_a, dtype=np.float32), name='disp_A'))
+        
+        mapper = vtk.vtkPolyDataMapper()
+        mapper.SetInputData(mesh)
+        mapper.ScalarVisibilityOff()
+        # dispA is in model units, so keep vertexMC unshifted/unscaled (DISABLE_SHIFT_SCALE)
+        mapper.SetVBOShiftScaleMethod(0)
+        mapper.MapDataArrayToVertexAttribute(
+            'dispA', 'disp_A', vtk.vtkDataObject.FIELD_ASSOCIATION_POINTS, -1)
+        
+        actor = pv.Actor(mapper=mapper)
+        prop = actor.prop
+        prop.color = part['color']
+        prop.opacity = 1.0
+        prop.interpolation = 'Phong'
+        prop.ambient = 0.35
+        prop.diffuse = 0.75
+        prop.specular = 0.25
+        prop.specular_power = 20
+        
+        shader = actor.GetShaderProperty()
+        shader.AddVertexShaderReplacement('//VTK::PositionVC::Dec', True, MOVEMENT_VS_DEC, False)
+        shader.AddVertexShaderReplacement('//VTK::PositionVC::Impl', True, MOVEMENT_VS_IMPL, False)
+        uniforms = shader.GetVertexCustomUniforms()
+        uniforms.SetUniformf('moveK', 0.0)
+        disp_b = part['disp_B'] if part['disp_B'] is not None else (0.0, 0.0, 0.0)
+        uniforms.SetUniform3f('dispB', [float(v) for v in disp_b])
+        
+        self.plotter.add_actor(actor)
+        return actor
+    
+    def _build_movement_buffers(self):
+        """Concatenate the moving parts into float32 buffers; per-part arrays are row views.
+        
+        Each moving mesh's vtkPoints wraps its scratch view without copying, so
+        the movement update writes straight into VTK memory. Static meshes keep
+        their own points.
+        """
+        parts = self._moving_parts
+        sizes = [part['mesh'].n_points for part in parts]
+        offsets = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+        total = int(offsets[-1])
+        
+        self._orig_all = np.empty((total, 3), dtype=np.float32)
+        self._points_out = np.empty((total, 3), dtype=np.float32)
+        self._frame_factors = np.zeros(len(parts), dtype=np.float32)
+        self._omegas = np.array([
+            2 * math.pi * part['movement_config'].get('frequency', 0.85) for part in parts
+        ], dtype=np.float64)
+        self._phases = np.empty_like(self._omegas)
+        
+        # Largest per-vertex |disp_A| and |disp_B| bound how far a factor change moves a part
+        self._shown_factors = np.zeros(len(parts), dtype=np.float32)
+        self._disp_a_reach = np.array([
+            np.linalg.norm(np.atleast_2d(part['disp_A']), axis=1).max() for part in parts
+        ], dtype=np.float32)
+        self._disp_b_reach = np.array([
+            np.linalg.norm(part['disp_B']) if part['disp_B'] is not None else 0.0
+            for part in parts
+        ], dtype=np.float32)
+        self._step_plan = []
+        
+        # The kernel's inputs are only needed when the CPU moves the points
+        self._use_kernel = HAS_NUMBA and not self._gpu_uniforms
+        if self._use_kernel:
+            self._part_index = np.repeat(np.arange(len(parts), dtype=np.int32), sizes)
+            self._disp_a_all = np.empty((total, 3), dtype=np.float32)
+            self._disp_b_all = np.zeros((len(parts), 3), dtype=np.float32)
+        
+        for p, part in enumerate(parts):
+            sl = slice(offsets[p], offsets[p + 1])
+            self._orig_all[sl] = part['mesh'].points
+            part['orig_points'] = self._orig_all[sl]
+            part['scratch'] = self._points_out[sl]
+            part['scratch'][:] = part['orig_points']
+            part['mesh'].points = part['scratch']
+            
+            if self._use_kernel:
+                # Translation bases broadcast to one row per vertex; per-vertex
+                # fields become views so they are not held twice
+                self._disp_a_all[sl] = part['disp_A']
+                if part['disp_A'].ndim == 2:
+                    part['disp_A'] = self._disp_a_all[sl]
+                if part['disp_B'] is not None:
+                    self._disp_b_all[p] = part['disp_B']
+            
+            self._step_plan.append((
+                part['mesh'].GetPoints(), part['orig_points'], part['disp_A'], part['disp_B'],
+                part['scratch']
+            ))
+    
     def _update_parts_list(self):
-        """Update parts list - ALL moving"""
+        """Update parts list - static parts marked separately"""
         self.parts_list.clear()
         for part in self.parts:
             config = part['movement_config']
-            icon = "🟢"
+            icon = "🟢" if part['moving'] else "⚪"
             move_type = config.get('movement_type', 'moving')
             part_type = part['type']
             item_text = f"{icon} [{part_type}] {part['region']}: {move_type}"
@@ -547,7 +779,9 @@ class CompleteSpinalMovement(QtWidgets.QMainWindow):
             self.status.setText("⏸ Paused")
         else:
             self.is_animating = True
-            self.timer.start()
+            self._last_t = time.perf_counter()
+            self._next_deadline = self._last_t + self.frame_interval
+            self.timer.start(int(self.frame_interval * 1000))
             self.btn_play.setText("⏸ PAUSE")
             self.status.setText("▶ All parts moving...")
     
@@ -556,95 +790,95 @@ class CompleteSpinalMovement(QtWidgets.QMainWindow):
         if not self.is_animating:
             return
         
-        dt = 0.033
+        # Advance by real elapsed time; cap it so a stall does not jump the phase
+        now = time.perf_counter()
+        dt = min(now - self._last_t, 0.1)
+        self._last_t = now
         self.time += dt * self.speed_factor
         
-        for part in self.parts:
-            config = part['movement_config']
-            
-            orig_points = self.original_positions[part['name']]
-            orig_center = self.original_centers[part['name']]
-            
-            movement_type = config.get('movement_type', 'subtle_wave')
-            amplitude = config.get('amplitude', 4.0) * self.global_amplitude
-            frequency = config.get('frequency', 0.85)
-            
-            new_points = orig_points.copy()
-            
-            # Different movement types
-            if movement_type == 'pulsation':
-                factor = np.sin(2 * np.pi * frequency * self.time)
-                vectors = new_points - orig_center
-                scale = 1.0 + (factor * amplitude / 100.0)
-                new_points = orig_center + vectors * scale
-                
-            elif movement_type == 'gentle_wave':
-                wave = np.sin(2 * np.pi * frequency * self.time)
-                new_points[:, 2] += wave * amplitude * 0.5
-                new_points[:, 0] += wave * amplitude * 0.3
-                
-            elif movement_type == 'wave':
-                wave = np.sin(2 * np.pi * frequency * self.time)
-                new_points[:, 0] += wave * amplitude
-                new_points[:, 2] += wave * amplitude * 0.5
-                
-            elif movement_type == 'subtle_pulse':
-                pulse = np.sin(2 * np.pi * frequency * self.time)
-                vectors = new_points - orig_center
-                scale = 1.0 + (pulse * amplitude / 200.0)
-                new_points = orig_center + vectors * scale
-                
-            elif movement_type == 'oscillate':
-                osc = np.sin(2 * np.pi * frequency * self.time)
-                new_points[:, 0] += osc * amplitude
-                new_points[:, 1] += osc * amplitude * 0.3
-                
-            elif movement_type == 'breathing':
-                breath = np.sin(2 * np.pi * frequency * self.time)
-                new_points[:, 2] += breath * amplitude
-                vectors = new_points - orig_center
-                scale = 1.0 + (breath * amplitude / 300.0)
-                new_points = orig_center + vectors * scale
-                
-            elif movement_type == 'gentle_pulse':
-                pulse = np.sin(2 * np.pi * frequency * self.time)
-                vectors = new_points - orig_center
-                scale = 1.0 + (pulse * amplitude / 150.0)
-                new_points = orig_center + vectors * scale
-                
-            elif movement_type == 'gentle_sway':
-                sway = np.sin(2 * np.pi * frequency * self.time)
-                new_points[:, 0] += sway * amplitude * 0.3
-                new_points[:, 1] += sway * amplitude * 0.2
-                
-            elif movement_type == 'subtle_wave':
-                wave = np.sin(2 * np.pi * frequency * self.time)
-                new_points[:, 2] += wave * amplitude * 0.4
-                new_points[:, 1] += wave * amplitude * 0.2
+        # All parts' factors in one vectorized sin: k = sin(omega * t) * amplitude
+        factors = self._frame_factors
+        phases = self._phases
+        np.multiply(self._omegas, self.time, out=phases)
+        np.sin(phases, out=phases)
+        np.multiply(phases, self.global_amplitude, out=factors)
+        
+        # Only touch the meshes and render when some part visibly moves
+        shown = self._shown_factors
+        moved = np.abs(factors - shown) * self._disp_a_reach
+        moved += np.abs(factors * factors - shown * shown) * self._disp_b_reach
+        if moved.max(initial=0.0) >= MIN_VISIBLE_MOVE:
+            self._apply_factors(factors)
+        
+        # Sleep until the next deadline; resync if the frame overran it
+        self._next_deadline += self.frame_interval
+        now = time.perf_counter()
+        if self._next_deadline < now:
+            self._next_deadline = now + self.frame_interval
+        self.timer.start(max(0, int((self._next_deadline - now) * 1000)))
+    
+    def _apply_factors(self, factors):
+        """Move every part to orig + A*k (+ B*k^2 for breathing) and render"""
+        plan = self._step_plan
+        if self._gpu_uniforms:
+            # Evaluated by the vertex shader; only k changes per frame
+            for uniforms, k in zip(self._gpu_uniforms, factors):
+                uniforms.SetUniformf('moveK', float(k))
+        else:
+            # Written into the parts' float32 scratch views
+            if self._use_kernel:
+                _movement_kernel(self._orig_all, self._disp_a_all, self._disp_b_all,
+                                 self._part_index, factors, self._points_out)
+            else:
+                for k, (_, orig, disp_a, disp_b, new_points) in zip(factors, plan):
+                    if disp_a.ndim == 1:
+                        # Translation: one pass, the offset is a single (3,) vector
+                        np.add(orig, disp_a * k, out=new_points)
+                        continue
+                    # Scaling about the centre: the (p - c) field is baked into
+                    # disp_A, so no per-frame vectors temporary is needed
+                    np.multiply(disp_a, k, out=new_points)
+                    new_points += orig
+                    if disp_b is not None:
+                        new_points += disp_b * (k * k)
             
-            # Update mesh
-            part['mesh'].points = new_points
-            part['mesh'].compute_normals(auto_orient_normals=True, inplace=True)
+            # The scratch views back the meshes' vtkPoints, so only flag them dirty.
+            # Translations and uniform scaling about the centre leave the normals
+            # computed at load time valid
+            for points, _, _, _, _ in plan:
+                points.Modified()
         
+        self._shown_factors[:] = factors
         self.plotter.render()
     
     def _reset(self):
         """Reset all parts"""
-        for part in self.parts:
-            part['mesh'].points = self.original_positions[part['name']].copy()
-            part['mesh'].compute_normals(auto_orient_normals=True, inplace=True)
+        if self._gpu_uniforms:
+            # The shader path never changes the points, so k = 0 is enough
+            for uniforms in self._gpu_uniforms:
+                uniforms.SetUniformf('moveK', 0.0)
+        else:
+            # One copy of the concatenated originals into the VTK-backed buffer
+            np.copyto(self._points_out, self._orig_all)
+            for points, _, _, _, _ in self._step_plan:
+                points.Modified()
+        self._shown_factors[:] = 0.0
         
         self.time = 0.0
         self.plotter.render()
         self.status.setText("🔄 Reset")
     
     def _update_amplitude(self, val):
-        self.global_amplitude = val / 100.0
         self.amp_label.setText(f"{val}%")
+        self.slider_timer.start()
     
     def _update_speed(self, val):
-        self.speed_factor = val / 10.0
         self.speed_label.setText(f"{val/10.0:.1f}x")
+        self.slider_timer.start()
+    
+    def _apply_sliders(self):
+        self.global_amplitude = self.amp_slider.value() / 100.0
+        self.speed_factor = self.speed_slider.value() / 10.0
 
 
 def main():
@@ -678,13 +912,8 @@ def main():
         return
     
     # Load files
-    spinal_files = glob.glob(os.path.join(spinal_path, "*.obj"))
-    spinal_files.extend(glob.glob(os.path.join(spinal_path, "*.OBJ")))
-    spinal_files = sorted(list(set(spinal_files)))
-    
-    muscle_files = glob.glob(os.path.join(muscle_path, "*.obj"))
-    muscle_files.extend(glob.glob(os.path.join(muscle_path, "*.OBJ")))
-    muscle_files = sorted(list(set(muscle_files)))
+    spinal_files = find_obj_files(spinal_path)
+    muscle_files = find_obj_files(muscle_path)
     
     if not spinal_files and not muscle_files:
         print("\n❌ No OBJ files found in either dataset\n")
@@ -0,0 +1,68 @@
+import os
+import sys
+import copy
+import json
+import runpy
+import traceback
+
+"""
+Persistent script runner for main_gui.py
+Reads {"file": ...} JSON lines from stdin and runs each script as __main__,
+so the heavy imports below are paid once instead of on every feature launch.
+"""
+
+# Printed after every script so the GUI knows the run has finished
+DONE_MARKER = "__MEDVIZ_DONE__"
+
+# Warm the shared imports once
+for module in ("numpy", "vtk", "pyvista", "PyQt5.QtWidgets", "pyvistaqt"):
+    try:
+        __import__(module)
+    except ImportError:
+        pass
+
+# Snapshot of the process state scripts are allowed to change
+PRISTINE_ENVIRON = dict(os.environ)
+PRISTINE_PATH = list(sys.path)
+if "pyvista" in sys.modules:
+    import pyvista as pv
+    PRISTINE_THEME = copy.deepcopy(pv.global_theme)
+    PRISTINE_OFF_SCREEN = pv.OFF_SCREEN
+
+
+def reset_state(script):
+    """Undo what the previous script left behind so each run starts fresh"""
+    sys.argv = [script]
+    sys.path[:] = PRISTINE_PATH
+    os.environ.clear()
+    os.environ.update(PRISTINE_ENVIRON)
+    
+    if "pyvista" in sys.modules:
+        pv.global_theme.load_theme(PRISTINE_THEME)
+        pv.OFF_SCREEN = PRISTINE_OFF_SCREEN
+    
+    if "matplotlib.pyplot" in sys.modules:
+        sys.modules["matplotlib.pyplot"].close('all')
+
+
+def main():
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            spec = json.loads(line)
+            reset_state(spec['file'])
+            runpy.run_path(spec['file'], run_name='__main__')
+        except SystemExit:
+            pass
+        except BaseException:
+            traceback.print_exc()
+        
+        sys.stdout.write(DONE_MARKER + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()